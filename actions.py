@@ -0,0 +1,214 @@
+import asyncio
+import json
+import logging
+import os
+import shlex
+import shutil
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import aiohttp
+from dotenv import load_dotenv
+from latency import Trace, mark
+
+load_dotenv()
+
+LOGGER: logging.Logger = logging.getLogger("actions")
+
+PAIR_URL_TEMPLATE: str = os.getenv(
+    "PAIR_URL_TEMPLATE",
+    "https://photon-sol.tinyastro.io/en/lp/{pair}?handle=4070371e951586cba5f04",
+)
+ACTION_COMMAND: str = os.getenv("ACTION_COMMAND", "")
+ACTION_WEBHOOK: str = os.getenv("ACTION_WEBHOOK", "")
+ACTION_SOCKET: str = os.getenv("ACTION_SOCKET", "")
+ACTION_TIMEOUT: float = float(os.getenv("ACTION_TIMEOUT", "5"))
+
+DESKTOP_PATH: str = os.path.join(os.path.expanduser("~"), "Desktop")
+DIR: str = os.path.join(DESKTOP_PATH, "scripts", "solana-bots")
+FILE_NAME: str = "pair.txt"
+FILE_PATH: str = os.path.join(DIR, FILE_NAME)
+SCRIPT_PATH: str = os.path.join(DIR, "scripts", "!1open-all-profiles-test.scpt")
+COMMAND: List[str] = ["osascript", SCRIPT_PATH]
+
+
+def pair_url(pair: str) -> str:
+    return PAIR_URL_TEMPLATE.format(pair=pair)
+
+
+class Sink:
+    name: str = "sink"
+    stage: str = "action_launched"
+    keepalive: bool = False
+    target: str = ""
+
+    async def start(self) -> None:
+        pass
+
+    async def ping(self) -> None:
+        pass
+
+    async def fire(self, payload: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class FileSink(Sink):
+    name = "file"
+    stage = "pair_written"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    async def start(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+    async def fire(self, payload: Dict[str, Any]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(payload["url"])
+        os.replace(tmp_path, self.path)
+
+
+class ProcessSink(Sink):
+    name = "process"
+
+    def __init__(self, command: List[str]) -> None:
+        self.command = command
+        self.processes: List[asyncio.Task] = []
+
+    async def fire(self, payload: Dict[str, Any]) -> None:
+        process = await asyncio.create_subprocess_exec(
+            *self.command,
+            env={**os.environ, "MINT": payload["mint"], "PAIR": payload["pair"]},
+        )
+        self.processes.append(asyncio.create_task(self.reap(process)))
+
+    async def reap(self, process: asyncio.subprocess.Process) -> None:
+        code = await process.wait()
+        if code == 0:
+            LOGGER.info(f"{self.command[0]} executed successfully.")
+        else:
+            LOGGER.error(f"{self.command[0]} exited with code {code}")
+
+    async def close(self) -> None:
+        await asyncio.gather(*self.processes, return_exceptions=True)
+
+
+class WebhookSink(Sink):
+    name = "webhook"
+    keepalive = True
+
+    def __init__(self, url: str) -> None:
+        self.url = self.target = url
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self) -> None:
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(keepalive_timeout=300, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=ACTION_TIMEOUT),
+        )
+
+    async def ping(self) -> None:
+        if self.session is None:
+            await self.start()
+        assert self.session is not None
+        async with self.session.head(self.url) as response:
+            await response.read()
+
+    async def fire(self, payload: Dict[str, Any]) -> None:
+        if self.session is None:
+            await self.start()
+        assert self.session is not None
+        async with self.session.post(self.url, json=payload) as response:
+            await response.read()
+            response.raise_for_status()
+
+    async def close(self) -> None:
+        if self.session:
+            await self.session.close()
+
+
+class UnixSocketSink(Sink):
+    name = "unix_socket"
+    keepalive = True
+
+    def __init__(self, path: str) -> None:
+        self.path = self.target = path
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def ping(self) -> None:
+        if self.writer is None or self.writer.is_closing():
+            _, self.writer = await asyncio.open_unix_connection(self.path)
+
+    async def fire(self, payload: Dict[str, Any]) -> None:
+        await self.ping()
+        assert self.writer is not None
+        self.writer.write(json.dumps(payload).encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        if self.writer:
+            self.writer.close()
+
+
+class ActionDispatcher:
+    def __init__(self, sinks: List[Sink]) -> None:
+        self.sinks = sinks
+
+    async def start(self) -> None:
+        await asyncio.gather(*[sink.start() for sink in self.sinks])
+        LOGGER.info(f"Action sinks: {', '.join(sink.name for sink in self.sinks)}")
+
+    def pings(self) -> Dict[str, Callable[[], Awaitable[None]]]:
+        return {
+            f"{sink.name} {sink.target}": sink.ping
+            for sink in self.sinks
+            if sink.keepalive
+        }
+
+    async def fire(
+        self, sink: Sink, payload: Dict[str, Any], trace: Optional[Trace]
+    ) -> bool:
+        started_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(sink.fire(payload), ACTION_TIMEOUT)
+        except Exception as e:
+            LOGGER.error(f"Action sink {sink.name} failed: {e!r}")
+            return False
+        mark(trace, sink.stage)
+        elapsed = (time.perf_counter() - started_at) * 1000
+        LOGGER.info(f"Action sink {sink.name} fired in {elapsed:.1f}ms")
+        return True
+
+    async def dispatch(
+        self, mint: str, pair: str, trace: Optional[Trace] = None
+    ) -> bool:
+        payload = {"mint": mint, "pair": pair, "url": pair_url(pair)}
+        results = await asyncio.gather(
+            *[self.fire(sink, payload, trace) for sink in self.sinks]
+        )
+        return all(results)
+
+    async def close(self) -> None:
+        await asyncio.gather(
+            *[sink.close() for sink in self.sinks], return_exceptions=True
+        )
+
+
+def build_dispatcher(
+    file_path: str = FILE_PATH, command: List[str] = COMMAND
+) -> ActionDispatcher:
+    sinks: List[Sink] = [FileSink(file_path)]
+    if ACTION_COMMAND:
+        command = shlex.split(ACTION_COMMAND)
+    if command and shutil.which(command[0]):
+        sinks.append(ProcessSink(command))
+    elif command:
+        LOGGER.warning(f"{command[0]} is not available, skipping the process sink")
+    if ACTION_WEBHOOK:
+        sinks.append(WebhookSink(ACTION_WEBHOOK))
+    if ACTION_SOCKET:
+        sinks.append(UnixSocketSink(ACTION_SOCKET))
+    return ActionDispatcher(sinks)
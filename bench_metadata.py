@@ -0,0 +1,111 @@
+import argparse
+import base64
+import struct
+import timeit
+import base58
+from construct import Struct, Int8ul, Int32ul, Bytes, GreedyBytes  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from pump_decode import (
+    CREATE_EVENT_DISCRIMINATOR,
+    MetadataView,
+    decode_create_event,
+    decode_metadata,
+)
+
+METADATA_SCHEMA = Struct(
+    "key" / Int8ul,
+    "name_length" / Int32ul,
+    "name" / Bytes(lambda this: this.name_length),
+    "symbol_length" / Int32ul,
+    "symbol" / Bytes(lambda this: this.symbol_length),
+    "uri_length" / Int32ul,
+    "uri" / Bytes(lambda this: this.uri_length),
+    "other" / GreedyBytes,
+)
+
+
+def encode_string(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    return struct.pack("<I", len(raw)) + raw
+
+
+def sample_metadata() -> bytes:
+    return (
+        bytes([33])
+        + encode_string("TESTBABA")
+        + encode_string("BABUN")
+        + encode_string("https://ipfs.io/ipfs/" + "Qm" + "x" * 44)
+        + bytes(64)
+    )
+
+
+def sample_create_event() -> bytes:
+    return (
+        CREATE_EVENT_DISCRIMINATOR
+        + sample_metadata()[1:-64]
+        + bytes(Pubkey.new_unique())
+        + bytes(Pubkey.new_unique())
+        + bytes(Pubkey.new_unique())
+    )
+
+
+def construct_path(data_base58: str) -> tuple:
+    metadata = METADATA_SCHEMA.parse(base58.b58decode(data_base58))
+    return metadata.name.decode("utf-8"), metadata.symbol.decode("utf-8")
+
+
+def view_path(data_base58: str) -> tuple:
+    metadata = decode_metadata(data_base58)
+    return metadata.name, metadata.symbol
+
+
+def report(label: str, seconds: float, number: int) -> None:
+    print(f"{label:<32} {seconds / number * 1e6:8.2f} us/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark construct vs memoryview metadata decoding."
+    )
+    parser.add_argument(
+        "-n",
+        "--number",
+        type=int,
+        default=100_000,
+        help="Iterations per benchmark (default: 100000)",
+    )
+    args = parser.parse_args()
+
+    raw = sample_metadata()
+    data_base58 = base58.b58encode(raw).decode("utf-8")
+    event_base64 = base64.b64encode(sample_create_event()).decode("utf-8")
+    assert construct_path(data_base58) == view_path(data_base58)
+
+    n = args.number
+    report(
+        "construct parse (raw)",
+        timeit.timeit(lambda: METADATA_SCHEMA.parse(raw), number=n),
+        n,
+    )
+    report(
+        "memoryview parse (raw)", timeit.timeit(lambda: MetadataView(raw), number=n), n
+    )
+    report(
+        "construct parse (base58)",
+        timeit.timeit(lambda: construct_path(data_base58), number=n),
+        n,
+    )
+    report(
+        "memoryview parse (base58)",
+        timeit.timeit(lambda: view_path(data_base58), number=n),
+        n,
+    )
+    report(
+        "create event (base64)",
+        timeit.timeit(lambda: decode_create_event(event_base64), number=n),
+        n,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import random
+import re
+import time
+from typing import Callable, List, Optional, Tuple
+from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from mint_scanner import best_mint
+
+WORDS: List[str] = (
+    "gm ser new launch just dropped lfg moon soon ape in dont miss this one "
+    "fair launch no presale community takeover devs doxxed wagmi ngmi"
+).split()
+
+
+def extract_and_validate_mint_address(text: str) -> Optional[str]:
+    url_pattern = re.compile(r"https:\/\/(www\.)?pump\.fun\/[A-Za-z0-9]+")
+    pubkey_pattern = re.compile(r"\b[1-9A-HJ-NP-Za-km-z]{43,44}\b")
+
+    url_match = url_pattern.search(text)
+    pubkey_match = pubkey_pattern.search(text)
+
+    if not url_match and not pubkey_match:
+        return None
+
+    mint_address = None
+
+    if pubkey_match:
+        mint_address = pubkey_match.group(0)
+    elif url_match:
+        url = url_match.group(0)
+        mint_address = url.split("/")[-1]
+
+    if not mint_address:
+        return None
+
+    try:
+        Pubkey.from_string(mint_address)
+        return mint_address
+    except Exception as e:
+        return None
+
+
+def sample_tweet(rng: random.Random) -> Tuple[str, Optional[str]]:
+    words = rng.choices(WORDS, k=rng.randint(5, 30))
+    kind = rng.random()
+    if kind < 0.6:
+        return " ".join(words), None
+    mint = str(Keypair().pubkey())
+    if kind < 0.75:
+        words.insert(rng.randrange(len(words) + 1), f"CA:{mint}.")
+    elif kind < 0.9:
+        words.insert(rng.randrange(len(words) + 1), f"https://pump.fun/coin/{mint}")
+    else:
+        decoy = str(Keypair().pubkey())
+        words.insert(0, f"old {decoy}")
+        words.append(f"https://pump.fun/{mint}")
+    return " ".join(words), mint
+
+
+def run(
+    label: str, extract: Callable[[str], Optional[str]], corpus: List[Tuple]
+) -> None:
+    started_at = time.perf_counter()
+    results = [extract(text) for text, _ in corpus]
+    elapsed = time.perf_counter() - started_at
+    expected = [mint for _, mint in corpus]
+    correct = sum(1 for got, want in zip(results, expected) if got == want)
+    print(
+        f"{label:<20} {elapsed / len(corpus) * 1e6:8.2f} us/tweet "
+        f"{len(corpus) / elapsed:10.0f} tweets/s "
+        f"correct={correct}/{len(corpus)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the mint scanner over a synthetic tweet corpus."
+    )
+    parser.add_argument(
+        "-n",
+        "--number",
+        type=int,
+        default=100_000,
+        help="Tweets in the corpus (default: 100000)",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [sample_tweet(rng) for _ in range(args.number)]
+    run("regex per call", extract_and_validate_mint_address, corpus)
+    run("mint scanner", best_mint, corpus)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Type, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def map_chunks(
+    fn: Callable[[List[T]], R],
+    items: Iterable[T],
+    chunk_size: int,
+    workers: Optional[int] = None,
+    executor_class: Type[Executor] = ProcessPoolExecutor,
+) -> Iterator[R]:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunked(items, chunk_size):
+            yield fn(chunk)
+        return
+    with executor_class(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+        for chunk in chunked(items, chunk_size):
+            pending.append(executor.submit(fn, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
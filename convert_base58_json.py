@@ -1,53 +1,213 @@
+import argparse
 import base58
 from solders.keypair import Keypair  # type: ignore
-import json
+import functools
 import os
 import csv
+import time
+from typing import IO, Callable, Iterable, Iterator, List, Optional, Tuple
+from chunk_pool import map_chunks
 
 TARGET_FOLDER = "./keys"
+KEYSTORE_JSONL = "./keys.jsonl"
+KEYSTORE_BINARY = "./keys.bin"
+RECORD_SIZE = 64
 
+Entry = Tuple[int, str]
+Converted = Tuple[int, bytes, str]
+ChunkResult = Tuple[List[Converted], List[Tuple[int, str]]]
 
-def convert_private_key_to_file(base58_private_key, file_path) -> None:
-    decoded_key = base58.b58decode(base58_private_key)
-    key_numbers = list(decoded_key)
-    with open(file_path, "w") as f:
-        json.dump(key_numbers, f, separators=(",", ":"))
-    print(f"Private key saved to {file_path}")
 
+def decode_private_key(base58_private_key: str) -> Keypair:
+    return Keypair.from_bytes(base58.b58decode(base58_private_key))
 
-def process_keys_txt(input_file) -> None:
-    with open(input_file, "r") as f:
-        private_keys = f.readlines()
 
-    for idx, base58_private_key in enumerate(private_keys, start=1):
-        if len(base58_private_key) < 10:
-            continue
-        base58_private_key = base58_private_key.strip()
-        file_path = f"./keys/key{idx}.json"
-        convert_private_key_to_file(base58_private_key, file_path)
+def write_key_file(secret: bytes, file_path: str) -> None:
+    with open(file_path, "w") as f:
+        f.write("[" + ",".join(map(str, secret)) + "]")
 
 
-def process_keys_csv(input_file) -> None:
+def read_keys_txt(input_file) -> Iterator[Entry]:
     with open(input_file, "r") as f:
+        for idx, base58_private_key in enumerate(f, start=1):
+            if len(base58_private_key) < 10:
+                continue
+            yield idx, base58_private_key.strip()
+
+
+def read_keys_csv(input_file) -> Iterator[Entry]:
+    with open(input_file, "r", newline="") as f:
         private_keys = csv.reader(f, delimiter=",")
 
-        next(private_keys)  # Skip header
+        next(private_keys, None)  # Skip header
 
         for idx, row in enumerate(private_keys, start=1):
-            base58_private_key = row[1]
-            file_path = f"./keys/key{idx}.json"
-            convert_private_key_to_file(base58_private_key, file_path)
+            yield idx, row[1]
 
 
-if __name__ == "__main__":
-    input_file = "./private.txt"
+def convert_chunk(chunk: List[Entry], folder: Optional[str]) -> ChunkResult:
+    converted: List[Converted] = []
+    errors: List[Tuple[int, str]] = []
+    for idx, base58_private_key in chunk:
+        try:
+            keypair = decode_private_key(base58_private_key)
+        except Exception as e:
+            errors.append((idx, str(e)))
+            continue
+        if folder is not None:
+            write_key_file(bytes(keypair), os.path.join(folder, f"key{idx}.json"))
+            converted.append((idx, b"", ""))
+        else:
+            converted.append((idx, bytes(keypair), str(keypair.pubkey())))
+    return converted, errors
+
+
+class JsonLinesWriter:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.f: IO[str] = open(path, "w")
+
+    def write(self, idx: int, secret: bytes, public_key: str) -> None:
+        self.f.write(
+            f'{{"index":{idx},"public_key":"{public_key}",'
+            f'"secret_key":[{",".join(map(str, secret))}]}}\n'
+        )
+
+    def close(self) -> None:
+        self.f.close()
+
+
+class BinaryWriter:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.f: IO[bytes] = open(path, "wb")
+        self.index: IO[str] = open(f"{path}.idx", "w")
+        self.index.write("record,index,public_key\n")
+        self.records = 0
+
+    def write(self, idx: int, secret: bytes, public_key: str) -> None:
+        self.f.write(secret)
+        self.index.write(f"{self.records},{idx},{public_key}\n")
+        self.records += 1
+
+    def close(self) -> None:
+        self.f.close()
+        self.index.close()
 
-    os.makedirs(TARGET_FOLDER, exist_ok=True)
-    _, ext = os.path.splitext(input_file)
+
+def read_binary_record(path: str, record: int) -> Keypair:
+    with open(path, "rb") as f:
+        f.seek(record * RECORD_SIZE)
+        return Keypair.from_bytes(f.read(RECORD_SIZE))
+
+
+def convert(
+    entries: Iterable[Entry],
+    output_format: str,
+    output: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> None:
+    folder: Optional[str] = None
+    write: Optional[Callable[[int, bytes, str], None]] = None
+    writer = None
+    if output_format == "files":
+        os.makedirs(output, exist_ok=True)
+        folder = output
+    elif output_format == "jsonl":
+        writer = JsonLinesWriter(output)
+        write = writer.write
+    else:
+        writer = BinaryWriter(output)
+        write = writer.write
+
+    started_at = time.perf_counter()
+    converted = 0
+    failed = 0
+    try:
+        for results, errors in map_chunks(
+            functools.partial(convert_chunk, folder=folder),
+            entries,
+            chunk_size,
+            workers,
+        ):
+            if write is not None:
+                for idx, secret, public_key in results:
+                    write(idx, secret, public_key)
+            converted += len(results)
+            failed += len(errors)
+            for idx, error in errors:
+                print(f"Invalid private key on line {idx}: {error}")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"Converted {converted} keys ({failed} invalid) to {output} in "
+        f"{elapsed:.2f}s ({converted / elapsed if elapsed else 0:.0f} keys/s)"
+    )
+
+
+def process_keys_txt(
+    input_file, output_format="files", output=TARGET_FOLDER, **kwargs
+) -> None:
+    convert(read_keys_txt(input_file), output_format, output, **kwargs)
+
+
+def process_keys_csv(
+    input_file, output_format="files", output=TARGET_FOLDER, **kwargs
+) -> None:
+    convert(read_keys_csv(input_file), output_format, output, **kwargs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert base58 private keys to keypair files or a keystore."
+    )
+    parser.add_argument(
+        "input_file", nargs="?", default="./private.txt", help=".txt or .csv input"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["files", "jsonl", "binary"],
+        default="files",
+        help="One key{n}.json per key, a JSON-lines keystore or 64-byte records",
+    )
+    parser.add_argument("-o", "--output", default=None, help="Output folder or file")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Worker processes"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=1000, help="Keys per worker task"
+    )
+    args = parser.parse_args()
+
+    output = (
+        args.output
+        or {
+            "files": TARGET_FOLDER,
+            "jsonl": KEYSTORE_JSONL,
+            "binary": KEYSTORE_BINARY,
+        }[args.format]
+    )
+    _, ext = os.path.splitext(args.input_file)
     if ext == ".txt":
-        process_keys_txt(input_file)
+        process_keys = process_keys_txt
     elif ext == ".csv":
-        process_keys_csv(input_file)
+        process_keys = process_keys_csv
     else:
         print("Unsupported file format")
         exit(1)
+    process_keys(
+        args.input_file,
+        args.format,
+        output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
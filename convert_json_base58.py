@@ -1,74 +1,297 @@
-from os.path import join, getsize
 from pathlib import Path
-import os
-from typing import Any, List, Optional, Set
+import argparse
+import csv
+import hashlib
 import json
-import base58
-import pandas as pd
+import os
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from chunk_pool import map_chunks
 
 KEYS_FOLDER = Path("../../keys")
 CSV_TARGET = Path("keys.csv")
+MANIFEST_TARGET = Path("keys.manifest.json")
+COLUMNS = ["name", "private_key", "is_reserve", "public_key", "created_at"]
+CHUNK_SIZE = 256
+KEYPAIR_LENGTH = 64
+BYTE_VALUES: Dict[bytes, int] = {str(i).encode(): i for i in range(256)}
+
+Key = Tuple[bytes, str, str]  # raw public key, private key, public key
+Loaded = Tuple[str, Optional[Key], str]
+Hashed = Tuple[str, str, Optional[Key], str]
+ManifestEntry = List[Union[int, str]]  # size, mtime_ns, digest, public key
+
+
+def parse_key_array(raw: bytes) -> bytes:
+    raw = raw.strip()
+    if raw[:1] != b"[" or raw[-1:] != b"]":
+        raise ValueError("not a JSON array")
+    try:
+        secret = bytes(map(BYTE_VALUES.__getitem__, raw[1:-1].split(b",")))
+    except KeyError:
+        secret = bytes(json.loads(raw))  # Whitespace or other formatting
+    if len(secret) != KEYPAIR_LENGTH:
+        raise ValueError(f"expected {KEYPAIR_LENGTH} bytes, got {len(secret)}")
+    return secret
+
+
+def read_key_file(file_path: Union[str, os.PathLike]) -> bytes:
+    with open(file_path, "rb") as f:
+        return parse_key_array(f.read())
+
+
+def content_digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def load_key(raw: bytes) -> Key:
+    secret = parse_key_array(raw)
+    keypair = Keypair.from_bytes(secret)  # Checks the public half against the seed
+    return secret[32:], str(keypair), str(Pubkey.from_bytes(secret[32:]))
+
+
+def load_key_files(files: List[str]) -> List[Loaded]:
+    loaded: List[Loaded] = []
+    for file_path in files:
+        try:
+            with open(file_path, "rb") as f:
+                loaded.append((file_path, load_key(f.read()), ""))
+        except Exception as e:
+            loaded.append((file_path, None, str(e)))
+    return loaded
+
+
+def hash_key_files(files: List[str]) -> List[Hashed]:
+    hashed: List[Hashed] = []
+    for file_path in files:
+        try:
+            with open(file_path, "rb") as f:
+                raw = f.read()
+        except OSError as e:
+            hashed.append((file_path, "", None, str(e)))
+            continue
+        try:
+            hashed.append((file_path, content_digest(raw), load_key(raw), ""))
+        except Exception as e:
+            hashed.append((file_path, content_digest(raw), None, str(e)))
+    return hashed
+
+
+def scan_dir(dir: Union[str, os.PathLike]) -> Iterator[str]:
+    with os.scandir(dir) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from scan_dir(entry.path)
+        elif entry.name.endswith(".json") and entry.is_file():
+            yield entry.path
+
+
+def read_files(
+    files: Iterable[str],
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    loader: Callable[[List[str]], List[Any]] = load_key_files,
+) -> Iterator[Any]:
+    for loaded in map_chunks(loader, files, chunk_size, workers):
+        yield from loaded
+
+
+def read_dir(dir: Path, **kwargs) -> Iterator[Key]:
+    seen: Set[bytes] = set()
+    checked = 0
+    for file_path, key, error in read_files(scan_dir(dir), **kwargs):
+        checked += 1
+        if key is None:
+            print(f"Error occured during the read of '{file_path}': {error}")
+            continue
+        if key[0] in seen:
+            continue
+        seen.add(key[0])
+        yield key
+    print(f"Checked {checked} files")
 
 
-def get_keypair(private_key: bytes) -> Optional[Keypair]:
+def key_row(i: int, key: Key) -> List[Union[str, int]]:
+    _, private_key, public_key = key
+    return [f"wallet[{i}]", private_key, "false", public_key, 0]
+
+
+def write_csv(keys: Iterable[Key], csv_target: Path) -> int:
+    count = 0
+    with open(csv_target, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(COLUMNS)
+        for count, key in enumerate(keys, start=1):
+            writer.writerow(key_row(count, key))
+    return count
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
     try:
-        return Keypair.from_bytes(private_key)
-    except Exception as e:
-        print(e)
+        with open(path, "r") as f:
+            manifest = json.load(f)
+        if not isinstance(manifest.get("files"), dict):
+            raise ValueError("missing files")
+        return manifest
+    except FileNotFoundError:
+        return {"csv": None, "files": {}}
+    except (ValueError, AttributeError) as e:
+        print(f"Ignoring unreadable manifest {path}: {e}")
+        return {"csv": None, "files": {}}
+
+
+def save_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(json.dumps(manifest, separators=(",", ":")))
+    os.replace(tmp_path, path)
+
+
+def csv_stat(csv_target: Path) -> Optional[List[int]]:
+    try:
+        st = os.stat(csv_target)
+    except FileNotFoundError:
         return None
+    return [st.st_size, st.st_mtime_ns]
 
 
-def read_files(files: List[str], root: Path) -> List[Keypair]:
-    keys = []
-    print(f"Checking {len(files)} files")
-
-    for file in files:
-        file_path = root / file
-        if file_path.suffix == ".json":
-            with open(file_path, "r") as f:
-                try:
-                    content = bytes(json.loads(f.read()))
-                    keypair = get_keypair(content)
-                    if keypair:
-                        keys.append(keypair)
-                except Exception as e:
-                    print(f"Error occured during the read of '{file_path}': {e}")
-    return keys
-
-
-def read_dir(dir: Path) -> List[Keypair]:
-    keys_set: Set[Keypair] = set()
-    for root, _, files in os.walk(dir):
-        print(f"Checking '{root}' directory")
-        keys = read_files(files, Path(root))
-        print(f"Found {len(keys)} keys")
-        keys_set.update(set(keys))
-    return list(keys_set)
-
-
-def create_dataframe(raw_keys: List[Keypair]) -> pd.DataFrame:
-    return pd.DataFrame(
-        [
-            [
-                f"wallet[{i+1}]",
-                str(base58.b58encode(bytes(k)).decode("utf-8")),
-                "false",
-                str(k.pubkey()),
-                0,
-            ]
-            for i, k in enumerate(raw_keys)
-        ],
-        columns=["name", "private_key", "is_reserve", "public_key", "created_at"],
-    )
+def read_csv_keys(csv_target: Path) -> Tuple[Set[str], int]:
+    public_keys: Set[str] = set()
+    last_wallet = 0
+    try:
+        with open(csv_target, "r", newline="") as f:
+            for row in csv.DictReader(f):
+                public_keys.add(row["public_key"])
+                name = row["name"]
+                if name.startswith("wallet[") and name[7:-1].isdigit():
+                    last_wallet = max(last_wallet, int(name[7:-1]))
+    except FileNotFoundError:
+        pass
+    return public_keys, last_wallet
+
+
+def consolidate(
+    keys_folder: Path,
+    csv_target: Path = CSV_TARGET,
+    manifest_target: Path = MANIFEST_TARGET,
+    **kwargs,
+) -> int:
+    manifest = load_manifest(manifest_target)
+    previous_files: Dict[str, ManifestEntry] = manifest["files"]
+    known = previous_files
+    if manifest["csv"] != csv_stat(csv_target):
+        if known:
+            print(f"{csv_target} changed outside of incremental runs, rescanning")
+        known = {}
+
+    prefix = len(os.path.join(keys_folder, ""))
+    files: Dict[str, ManifestEntry] = {}
+    candidates: List[str] = []
+    for file_path in scan_dir(keys_folder):
+        relative = file_path[prefix:]
+        st = os.stat(file_path)
+        entry = known.get(relative)
+        if entry is not None and entry[:2] == [st.st_size, st.st_mtime_ns]:
+            files[relative] = entry
+        else:
+            files[relative] = [st.st_size, st.st_mtime_ns, "", ""]
+            candidates.append(file_path)
+
+    for relative in sorted(previous_files.keys() - files.keys()):
+        public_key = previous_files[relative][3]
+        print(
+            f"Removed '{relative}'"
+            + (f" ({public_key} kept in {csv_target})" if public_key else "")
+        )
+
+    public_keys: Optional[Set[str]] = None
+    last_wallet = 0
+    appended = 0
+    writer = None
+    f = None
+    try:
+        for file_path, digest, key, error in read_files(
+            candidates, loader=hash_key_files, **kwargs
+        ):
+            relative = file_path[prefix:]
+            entry = files[relative]
+            previous = known.get(relative)
+            if previous is not None and digest and previous[2] == digest:
+                entry[2:] = previous[2:]
+                continue
+            entry[2] = digest
+            if key is None:
+                print(f"Error occured during the read of '{file_path}': {error}")
+                continue
+            public_key = key[2]
+            if public_keys is None:
+                public_keys, last_wallet = read_csv_keys(csv_target)
+            if public_key not in public_keys:
+                if writer is None:
+                    is_new = not os.path.exists(csv_target)
+                    f = open(csv_target, "a", newline="")
+                    writer = csv.writer(f, lineterminator="\n")
+                    if is_new:
+                        writer.writerow(COLUMNS)
+                last_wallet += 1
+                appended += 1
+                writer.writerow(key_row(last_wallet, key))
+                public_keys.add(public_key)
+            entry[3] = public_key
+    finally:
+        if f is not None:
+            f.close()
+
+    print(f"Checked {len(candidates)} new or changed of {len(files)} files")
+    if candidates or len(files) != len(known):
+        save_manifest(manifest_target, {"csv": csv_stat(csv_target), "files": files})
+    return appended
 
 
 def main() -> None:
-    keypairs = read_dir(KEYS_FOLDER)
-    print(f"Found {len(keypairs)} unique keys")
-    dt = create_dataframe(keypairs)
-    dt.to_csv(CSV_TARGET, index=False, sep=",")
-    print(f"Created {CSV_TARGET} with the processed keys")
+    parser = argparse.ArgumentParser(
+        description="Consolidate keypair JSON files into a CSV of unique wallets."
+    )
+    parser.add_argument("keys_folder", nargs="?", type=Path, default=KEYS_FOLDER)
+    parser.add_argument("-o", "--output", type=Path, default=CSV_TARGET)
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Worker processes"
+    )
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        help="Only read new or changed files and append new wallets to the CSV",
+    )
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_TARGET)
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    if args.incremental:
+        count = consolidate(
+            args.keys_folder, args.output, args.manifest, workers=args.workers
+        )
+        elapsed = time.perf_counter() - started_at
+        print(f"Appended {count} new keys to {args.output} in {elapsed * 1000:.0f}ms")
+        return
+    count = write_csv(read_dir(args.keys_folder, workers=args.workers), args.output)
+    elapsed = time.perf_counter() - started_at
+    print(f"Found {count} unique keys")
+    print(f"Created {args.output} with the processed keys in {elapsed:.2f}s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class SeenCache:
+    def __init__(self, max_size: int = 100_000, ttl: float = 600.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        expires_at = self.entries.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def evict(self, now: float) -> None:
+        while self.entries:
+            key, expires_at = next(iter(self.entries.items()))
+            if len(self.entries) <= self.max_size and expires_at > now:
+                break
+            del self.entries[key]
+            self.evictions += 1
+
+    def seen(self, key: Hashable) -> bool:
+        now = time.monotonic()
+        expires_at = self.entries.get(key)
+        if expires_at is not None and expires_at > now:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True
+        self.entries[key] = now + self.ttl
+        self.entries.move_to_end(key)
+        self.misses += 1
+        self.evict(now)
+        return False
+
+    def summary(self) -> str:
+        return (
+            f"size={len(self.entries)} hits={self.hits} misses={self.misses} "
+            f"evictions={self.evictions}"
+        )
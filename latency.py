@@ -0,0 +1,153 @@
+import atexit
+import json
+import os
+import signal
+import time
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ENABLED: bool = os.getenv("LATENCY", "false").lower() == "true"
+OUTPUT: str = os.getenv("LATENCY_OUTPUT", "latency.json")
+
+STAGES: List[str] = [
+    "log_filter_hit",
+    "tx_fetched",
+    "metadata_decoded",
+    "match",
+    "pda_derived",
+    "pair_written",
+    "action_launched",
+]
+
+SUB_BUCKET_BITS: int = 7
+SUB_BUCKET_MASK: int = (1 << SUB_BUCKET_BITS) - 1
+QUANTILES: List[float] = [0.5, 0.9, 0.99, 0.999]
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def record(self, micros: int) -> None:
+        shift = max(0, micros.bit_length() - SUB_BUCKET_BITS)
+        key = (shift << SUB_BUCKET_BITS) | (micros >> shift)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total += micros
+        self.max = max(self.max, micros)
+        self.min = micros if self.min is None else min(self.min, micros)
+
+    @staticmethod
+    def bucket_value(key: int) -> int:
+        shift = key >> SUB_BUCKET_BITS
+        return ((key & SUB_BUCKET_MASK) << shift) + ((1 << shift) >> 1)
+
+    def percentile(self, q: float) -> int:
+        if not self.count:
+            return 0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= target:
+                return min(self.bucket_value(key), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "min_us": self.min or 0,
+            "max_us": self.max,
+            "mean_us": self.total / self.count if self.count else 0,
+            **{f"p{q * 100:g}_us": self.percentile(q) for q in QUANTILES},
+        }
+
+
+HISTOGRAMS: Dict[str, Dict[str, Histogram]] = {}
+
+
+class Trace:
+    __slots__ = ("source", "started_at")
+
+    def __init__(self, source: str, started_at: float) -> None:
+        self.source = source
+        self.started_at = started_at
+
+
+def start_trace(source: str) -> Optional[Trace]:
+    if not ENABLED:
+        return None
+    return Trace(source, time.perf_counter())
+
+
+def mark(trace: Optional[Trace], stage: str) -> None:
+    if trace is None:
+        return
+    elapsed = int((time.perf_counter() - trace.started_at) * 1_000_000)
+    histograms = HISTOGRAMS.setdefault(trace.source, {})
+    histogram = histograms.get(stage)
+    if histogram is None:
+        histogram = histograms[stage] = Histogram()
+    histogram.record(elapsed)
+
+
+def ordered_stages(histograms: Dict[str, Histogram]) -> List[str]:
+    return sorted(
+        histograms, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)
+    )
+
+
+def to_json() -> str:
+    return json.dumps(
+        {
+            source: {
+                stage: histograms[stage].to_dict()
+                for stage in ordered_stages(histograms)
+            }
+            for source, histograms in HISTOGRAMS.items()
+        },
+        indent=2,
+    )
+
+
+def to_prometheus() -> str:
+    name = "sniper_stage_latency_seconds"
+    lines = [
+        f"# HELP {name} Time from frame receipt to each detection stage.",
+        f"# TYPE {name} summary",
+    ]
+    for source, histograms in HISTOGRAMS.items():
+        for stage in ordered_stages(histograms):
+            histogram = histograms[stage]
+            labels = f'source="{source}",stage="{stage}"'
+            for q in QUANTILES:
+                value = histogram.percentile(q) / 1_000_000
+                lines.append(f'{name}{{{labels},quantile="{q}"}} {value:.6f}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total / 1_000_000:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def dump(path: str = OUTPUT) -> None:
+    if not HISTOGRAMS:
+        return
+    content = to_prometheus() if path.endswith(".prom") else to_json()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    print(f"Latency histograms written to {path}")
+
+
+def install(path: str = OUTPUT) -> None:
+    if not ENABLED:
+        return
+    atexit.register(dump, path)
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda *_: dump(path))
@@ -0,0 +1,98 @@
+import re
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from solders.pubkey import Pubkey  # type: ignore
+
+BASE58: str = "1-9A-HJ-NP-Za-km-z"
+
+MAX_ADDRESS_LENGTH: int = 44
+CANDIDATE_PATTERN: re.Pattern = re.compile(rf"[{BASE58}]{{32,}}")
+PUMP_URL_PREFIXES: Tuple[str, ...] = ("pump.fun/", "pump.fun/coin/")
+COIN_PATH_PREFIX: str = "/coin/"
+
+IGNORED: FrozenSet[str] = frozenset(
+    [
+        "11111111111111111111111111111111",
+        "So11111111111111111111111111111111111111112",
+        "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",
+        "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL",
+        "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P",
+        "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM",
+    ]
+)
+
+URL_SCORE: int = 8
+COIN_PATH_SCORE: int = 4
+PUMP_SUFFIX_SCORE: int = 2
+ON_CURVE_SCORE: int = 1
+
+
+class MintCandidate(NamedTuple):
+    address: str
+    position: int
+    score: int
+
+
+def score_candidate(address: str, url: bool, coin: bool) -> Optional[int]:
+    if address in IGNORED:
+        return None
+    try:
+        Pubkey.from_string(address)
+    except ValueError:
+        return None
+    score = 0
+    if url:
+        score += URL_SCORE
+    if coin:
+        score += COIN_PATH_SCORE
+    if address.endswith("pump"):
+        score += PUMP_SUFFIX_SCORE
+    return score
+
+
+def break_ties(candidates: List[MintCandidate]) -> List[MintCandidate]:
+    return [
+        (
+            candidate._replace(score=candidate.score + ON_CURVE_SCORE)
+            if Pubkey.from_string(candidate.address).is_on_curve()
+            else candidate
+        )
+        for candidate in candidates
+    ]
+
+
+def rank(candidate: MintCandidate) -> Tuple[int, int]:
+    return -candidate.score, candidate.position
+
+
+def find_candidates(text: str) -> List[MintCandidate]:
+    found: Dict[str, MintCandidate] = {}
+    for match in CANDIDATE_PATTERN.finditer(text):
+        address = match.group()
+        if len(address) > MAX_ADDRESS_LENGTH:
+            continue
+        start = match.start()
+        prefix = text[max(0, start - 14) : start]
+        url = prefix.endswith(PUMP_URL_PREFIXES)
+        coin = not url and prefix.endswith(COIN_PATH_PREFIX)
+        previous = found.get(address)
+        if previous is not None and not (url or coin):
+            continue
+        score = score_candidate(address, url, coin)
+        if score is None:
+            continue
+        if previous is None or score > previous.score:
+            position = previous.position if previous else start
+            found[address] = MintCandidate(address, position, score)
+    candidates = sorted(found.values(), key=rank)
+    if len(candidates) > 1 and candidates[0].score == candidates[1].score:
+        candidates = sorted(break_ties(candidates), key=rank)
+    return candidates
+
+
+def scan_mints(text: str) -> List[str]:
+    return [candidate.address for candidate in find_candidates(text)]
+
+
+def best_mint(text: str) -> Optional[str]:
+    candidates = find_candidates(text)
+    return candidates[0].address if candidates else None
@@ -0,0 +1,517 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import struct
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+import aiohttp
+import base58
+from aiohttp import web
+from solders.pubkey import Pubkey  # type: ignore
+from pump_pda import find_bonding_curve
+
+PUMP_PROGRAM: str = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+PUMP_MINT_AUTHORITY: str = "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM"
+METADATA_PROGRAM: str = "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"
+SYSTEM_PROGRAM: str = "11111111111111111111111111111111"
+TOKEN_PROGRAM: str = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+MAX_MULTIPLE_ACCOUNTS: int = 100
+CREATE_EVENT_DISCRIMINATOR: bytes = hashlib.sha256(b"event:CreateEvent").digest()[:8]
+HISTORY_SIZE: int = 10_000
+
+
+def random_pubkey() -> str:
+    return base58.b58encode(os.urandom(32)).decode("utf-8")
+
+
+def random_signature() -> str:
+    return base58.b58encode(os.urandom(64)).decode("utf-8")
+
+
+def encode_string(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    return struct.pack("<I", len(raw)) + raw
+
+
+def rpc_result(request_id: Any, result: Any) -> Dict:
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def rpc_error(request_id: Any, code: int, message: str) -> Dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+class SyntheticCreate:
+    def __init__(self, slot: int, name: str, symbol: str) -> None:
+        self.slot = slot
+        self.name = name
+        self.symbol = symbol
+        self.signature = random_signature()
+        self.creator = random_pubkey()
+        self.mint = random_pubkey()
+        self.bonding_curve = str(find_bonding_curve(Pubkey.from_string(self.mint)))
+        self.created_at = time.monotonic()
+        self.uri = f"https://ipfs.io/ipfs/{self.mint}"
+
+    def strings(self) -> bytes:
+        return (
+            encode_string(self.name)
+            + encode_string(self.symbol)
+            + encode_string(self.uri)
+        )
+
+    def logs(self) -> List[str]:
+        event = (
+            CREATE_EVENT_DISCRIMINATOR
+            + self.strings()
+            + base58.b58decode(self.mint)
+            + base58.b58decode(self.bonding_curve)
+            + base58.b58decode(self.creator)
+        )
+        return [
+            f"Program {PUMP_PROGRAM} invoke [1]",
+            "Program log: Instruction: Create",
+            f"Program {METADATA_PROGRAM} invoke [2]",
+            f"Program {METADATA_PROGRAM} success",
+            f"Program data: {base64.b64encode(event).decode('utf-8')}",
+            f"Program {PUMP_PROGRAM} success",
+        ]
+
+    def notification(self, subscription: int, with_event: bool = True) -> Dict:
+        logs = self.logs() if with_event else self.logs()[:-2] + self.logs()[-1:]
+        return {
+            "jsonrpc": "2.0",
+            "method": "logsNotification",
+            "params": {
+                "result": {
+                    "context": {"slot": self.slot},
+                    "value": {"signature": self.signature, "err": None, "logs": logs},
+                },
+                "subscription": subscription,
+            },
+        }
+
+    def transaction(self) -> Dict:
+        accounts = [self.creator, self.mint, self.bonding_curve, PUMP_MINT_AUTHORITY]
+        metadata = bytes([33]) + self.strings() + bytes(3)
+        return {
+            "slot": self.slot,
+            "blockTime": int(time.time()),
+            "version": 0,
+            "transaction": {
+                "signatures": [self.signature],
+                "message": {
+                    "accountKeys": [
+                        {
+                            "pubkey": pubkey,
+                            "signer": index < 2,
+                            "writable": index < 3,
+                            "source": "transaction",
+                        }
+                        for index, pubkey in enumerate(accounts + [PUMP_PROGRAM])
+                    ],
+                    "recentBlockhash": random_pubkey(),
+                    "instructions": [
+                        {
+                            "programId": PUMP_PROGRAM,
+                            "accounts": accounts,
+                            "data": base58.b58encode(self.strings()).decode("utf-8"),
+                            "stackHeight": None,
+                        }
+                    ],
+                    "addressTableLookups": [],
+                },
+            },
+            "meta": {
+                "err": None,
+                "status": {"Ok": None},
+                "fee": 5000,
+                "preBalances": [0] * 5,
+                "postBalances": [0] * 5,
+                "innerInstructions": [
+                    {
+                        "index": 0,
+                        "instructions": [
+                            {
+                                "programId": METADATA_PROGRAM,
+                                "accounts": accounts[1:3],
+                                "data": base58.b58encode(metadata).decode("utf-8"),
+                                "stackHeight": 2,
+                            }
+                        ],
+                    }
+                ],
+                "logMessages": self.logs(),
+                "preTokenBalances": [],
+                "postTokenBalances": [],
+                "rewards": [],
+                "loadedAddresses": {"writable": [], "readonly": []},
+                "computeUnitsConsumed": 120_000,
+            },
+        }
+
+    def signature_status(self) -> Dict:
+        return {
+            "signature": self.signature,
+            "slot": self.slot,
+            "err": None,
+            "memo": None,
+            "blockTime": None,
+            "confirmationStatus": "confirmed",
+        }
+
+
+class MockSolana:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        index_lag: float = 0.0,
+        rate: float = 0.0,
+        noise_rate: float = 0.0,
+        event_ratio: float = 1.0,
+        target: Optional[Tuple[str, str]] = None,
+        target_after: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.index_lag = index_lag
+        self.rate = rate
+        self.noise_rate = noise_rate
+        self.event_ratio = event_ratio
+        self.target = target
+        self.target_after = target_after
+
+        self.slot = 300_000_000
+        self.creates: Dict[str, SyntheticCreate] = {}
+        self.history: Deque[SyntheticCreate] = deque()
+        self.subscribers: Dict[web.WebSocketResponse, int] = {}
+        self.next_subscription = 1
+        self.generator: Optional[asyncio.Task] = None
+        self.target_signature: Optional[str] = None
+
+        self.requests: Dict[str, int] = {}
+        self.errors = 0
+        self.frames = 0
+        self.methods: Dict[str, Callable[[List], Awaitable[Any]]] = {
+            "getTransaction": self.get_transaction,
+            "getSignaturesForAddress": self.get_signatures_for_address,
+            "getMultipleAccounts": self.get_multiple_accounts,
+            "getTokenAccountsByOwner": self.get_token_accounts_by_owner,
+            "getHealth": self.get_health,
+        }
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/", self.handle_websocket)
+        app.router.add_post("/", self.handle_rpc)
+        app.on_startup.append(self.start_generator)
+        app.on_cleanup.append(self.stop_generator)
+        return app
+
+    async def simulate_network(self) -> None:
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def handle_rpc(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await self.simulate_network()
+        if isinstance(body, list):
+            return web.json_response([await self.dispatch(item) for item in body])
+        if self.error_rate and random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, text="Service unavailable")
+        return web.json_response(await self.dispatch(body))
+
+    async def dispatch(self, body: Dict) -> Dict:
+        method = body.get("method", "")
+        self.requests[method] = self.requests.get(method, 0) + 1
+        handler = self.methods.get(method)
+        if handler is None:
+            return rpc_error(body.get("id"), -32601, f"Method not found: {method}")
+        try:
+            return rpc_result(body.get("id"), await handler(body.get("params", [])))
+        except ValueError as e:
+            return rpc_error(body.get("id"), -32602, str(e))
+
+    async def get_health(self, params: List) -> str:
+        return "ok"
+
+    async def get_transaction(self, params: List) -> Optional[Dict]:
+        create = self.creates.get(params[0])
+        if create is None or time.monotonic() - create.created_at < self.index_lag:
+            return None
+        return create.transaction()
+
+    async def get_signatures_for_address(self, params: List) -> List[Dict]:
+        options = params[1] if len(params) > 1 and params[1] else {}
+        limit = options.get("limit") or 1000
+        before = options.get("before")
+        until = options.get("until")
+        results = []
+        skipping = before is not None
+        for create in reversed(self.history):
+            if skipping:
+                skipping = create.signature != before
+                continue
+            if create.signature == until or len(results) >= limit:
+                break
+            results.append(create.signature_status())
+        return results
+
+    async def get_multiple_accounts(self, params: List) -> Dict:
+        if len(params[0]) > MAX_MULTIPLE_ACCOUNTS:
+            raise ValueError(f"Too many inputs provided; max {MAX_MULTIPLE_ACCOUNTS}")
+        value = []
+        for pubkey in params[0]:
+            digest = hashlib.sha256(pubkey.encode("utf-8")).digest()
+            lamports = int.from_bytes(digest[:4], "little")
+            value.append(
+                {
+                    "data": ["", "base64"],
+                    "executable": False,
+                    "lamports": lamports,
+                    "owner": SYSTEM_PROGRAM,
+                    "rentEpoch": 0,
+                    "space": 0,
+                }
+            )
+        return {"context": {"slot": self.slot}, "value": value}
+
+    async def get_token_accounts_by_owner(self, params: List) -> Dict:
+        owner = params[0]
+        digest = hashlib.sha256(owner.encode("utf-8")).digest()
+        value = []
+        for index in range(digest[4] % 3):
+            seed = hashlib.sha256(digest + bytes([index])).digest()
+            amount = int.from_bytes(seed[:6], "little")
+            decimals = 6
+            ui_amount = amount / 10**decimals
+            value.append(
+                {
+                    "pubkey": base58.b58encode(seed).decode("utf-8"),
+                    "account": {
+                        "data": {
+                            "parsed": {
+                                "info": {
+                                    "isNative": False,
+                                    "mint": base58.b58encode(
+                                        hashlib.sha256(seed).digest()
+                                    ).decode("utf-8"),
+                                    "owner": owner,
+                                    "state": "initialized",
+                                    "tokenAmount": {
+                                        "amount": str(amount),
+                                        "decimals": decimals,
+                                        "uiAmount": ui_amount,
+                                        "uiAmountString": f"{ui_amount:f}",
+                                    },
+                                },
+                                "type": "account",
+                            },
+                            "program": "spl-token",
+                            "space": 165,
+                        },
+                        "executable": False,
+                        "lamports": 2039280,
+                        "owner": TOKEN_PROGRAM,
+                        "rentEpoch": 0,
+                        "space": 165,
+                    },
+                }
+            )
+        return {"context": {"slot": self.slot}, "value": value}
+
+    async def handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        try:
+            async for message in websocket:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = json.loads(message.data)
+                method = data.get("method")
+                if method == "logsSubscribe":
+                    subscription = self.next_subscription
+                    self.next_subscription += 1
+                    await websocket.send_json(rpc_result(data["id"], subscription))
+                    self.subscribers[websocket] = subscription
+                    await self.on_subscribe(websocket, subscription)
+                elif method == "logsUnsubscribe":
+                    self.subscribers.pop(websocket, None)
+                    await websocket.send_json(rpc_result(data["id"], True))
+                else:
+                    await websocket.send_json(
+                        rpc_error(data.get("id"), -32601, f"Method not found: {method}")
+                    )
+        finally:
+            self.subscribers.pop(websocket, None)
+        return websocket
+
+    async def on_subscribe(
+        self, websocket: web.WebSocketResponse, subscription: int
+    ) -> None:
+        pass
+
+    async def broadcast(self, build: Callable[[int], Dict]) -> None:
+        for websocket, subscription in list(self.subscribers.items()):
+            if websocket.closed:
+                self.subscribers.pop(websocket, None)
+                continue
+            await websocket.send_str(json.dumps(build(subscription)))
+            self.frames += 1
+
+    def next_create(self, index: int) -> SyntheticCreate:
+        self.slot += 1
+        if self.target and index == self.target_after:
+            create = SyntheticCreate(self.slot, *self.target)
+            self.target_signature = create.signature
+            print(f"Emitting target {create.name} | {create.symbol} mint {create.mint}")
+        else:
+            create = SyntheticCreate(self.slot, f"Token {index}", f"TK{index}")
+        if len(self.history) >= HISTORY_SIZE:
+            expired = self.history.popleft()
+            self.creates.pop(expired.signature, None)
+        self.creates[create.signature] = create
+        self.history.append(create)
+        return create
+
+    def noise(self, subscription: int) -> Dict:
+        return {
+            "jsonrpc": "2.0",
+            "method": "logsNotification",
+            "params": {
+                "result": {
+                    "context": {"slot": self.slot},
+                    "value": {
+                        "signature": random_signature(),
+                        "err": None,
+                        "logs": [
+                            f"Program {PUMP_PROGRAM} invoke [1]",
+                            "Program log: Instruction: Buy",
+                            f"Program {PUMP_PROGRAM} success",
+                        ],
+                    },
+                },
+                "subscription": subscription,
+            },
+        }
+
+    async def start_generator(self, app: web.Application) -> None:
+        if self.rate > 0 or self.noise_rate > 0:
+            self.generator = asyncio.create_task(self.generate())
+
+    async def stop_generator(self, app: web.Application) -> None:
+        if self.generator:
+            self.generator.cancel()
+
+    async def generate(self) -> None:
+        started_at = time.monotonic()
+        creates = 0
+        noise = 0
+        while True:
+            elapsed = time.monotonic() - started_at
+            while creates < int(elapsed * self.rate):
+                create = self.next_create(creates)
+                with_event = random.random() < self.event_ratio
+                await self.broadcast(
+                    lambda subscription: create.notification(subscription, with_event)
+                )
+                creates += 1
+            while noise < int(elapsed * self.noise_rate):
+                await self.broadcast(self.noise)
+                noise += 1
+            await asyncio.sleep(0.001)
+
+    def summary(self) -> str:
+        requests = " ".join(f"{m}={n}" for m, n in sorted(self.requests.items()))
+        return (
+            f"frames={self.frames} creates={len(self.history)} errors={self.errors} "
+            f"{requests}"
+        )
+
+
+async def serve(server: MockSolana, host: str, port: int) -> None:
+    runner = web.AppRunner(server.app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"Mock Solana listening on http://{host}:{port} (RPC=http://{host}:{port})")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(server.summary())
+    finally:
+        print(server.summary())
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Local mock Solana JSON-RPC and logs websocket server."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds per request"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of HTTP 503 responses"
+    )
+    parser.add_argument(
+        "--index-lag",
+        type=float,
+        default=0.0,
+        help="Seconds before a created transaction is returned by getTransaction",
+    )
+    parser.add_argument("--rate", type=float, default=1.0, help="Creates per second")
+    parser.add_argument(
+        "--noise-rate", type=float, default=0.0, help="Non-create frames per second"
+    )
+    parser.add_argument(
+        "--event-ratio",
+        type=float,
+        default=1.0,
+        help="Fraction of creates that carry the Program data event",
+    )
+    parser.add_argument("--target-name", default=None)
+    parser.add_argument("--target-symbol", default=None)
+    parser.add_argument(
+        "--target-after", type=int, default=100, help="Emit the target as create N"
+    )
+    args = parser.parse_args()
+
+    target = None
+    if args.target_name and args.target_symbol:
+        target = (args.target_name, args.target_symbol)
+    server = MockSolana(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        index_lag=args.index_lag,
+        rate=args.rate,
+        noise_rate=args.noise_rate,
+        event_ratio=args.event_ratio,
+        target=target,
+        target_after=args.target_after,
+    )
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        print("Exiting...")
+
+
+if __name__ == "__main__":
+    main()
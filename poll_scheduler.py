@@ -0,0 +1,158 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Optional
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def pause(self, seconds: float) -> None:
+        self.refill()
+        self.tokens = 0.0
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self.refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class UserState:
+    username: str
+    hot: bool = False
+    last_post_at: float = 0.0
+    next_due: float = 0.0
+    polls: int = 0
+    first_poll_at: float = 0.0
+
+    def polls_per_second(self, now: float) -> float:
+        elapsed = now - self.first_poll_at
+        return self.polls / elapsed if self.polls and elapsed > 0 else 0.0
+
+
+class PollScheduler:
+    def __init__(
+        self,
+        users: Iterable[str],
+        rate: float,
+        burst: float = 5.0,
+        hot_users: Iterable[str] = (),
+        hot_weight: float = 4.0,
+        recent_weight: float = 4.0,
+        recent_window: float = 600.0,
+        min_rate: float = 0.05,
+        headroom: float = 0.9,
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ) -> None:
+        hot = set(hot_users)
+        self.users: Dict[str, UserState] = {
+            username: UserState(username, username in hot) for username in users
+        }
+        if not self.users:
+            raise ValueError("At least one user is required")
+        self.bucket = TokenBucket(rate, burst)
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.hot_weight = hot_weight
+        self.recent_weight = recent_weight
+        self.recent_window = recent_window
+        self.headroom = headroom
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.backoff = min_backoff
+        self.throttled = 0
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+
+    def weight(self, user: UserState, now: float) -> float:
+        weight = self.hot_weight if user.hot else 1.0
+        if user.last_post_at and now - user.last_post_at < self.recent_window:
+            weight *= self.recent_weight
+        return weight
+
+    def interval(self, user: UserState, now: float) -> float:
+        total = sum(self.weight(u, now) for u in self.users.values())
+        return total / (self.weight(user, now) * self.bucket.rate)
+
+    async def next_user(self) -> str:
+        user = min(self.users.values(), key=lambda u: u.next_due)
+        delay = user.next_due - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self.bucket.acquire()
+        now = time.monotonic()
+        if not user.polls:
+            user.first_poll_at = now
+        user.polls += 1
+        user.next_due = now + self.interval(user, now)
+        return user.username
+
+    def mark_posted(self, username: str) -> None:
+        user = self.users.get(username)
+        if user is None:
+            return
+        now = time.monotonic()
+        user.last_post_at = now
+        user.next_due = min(user.next_due, now + self.interval(user, now))
+
+    def observe(self, status: int, headers: Mapping[str, str]) -> None:
+        if status == 429:
+            self.throttled += 1
+            retry_after = parse_number(headers.get("Retry-After"))
+            self.bucket.pause(retry_after if retry_after else self.backoff)
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+            return
+        self.backoff = self.min_backoff
+
+        limit = parse_number(headers.get("X-RateLimit-Requests-Limit"))
+        remaining = parse_number(headers.get("X-RateLimit-Requests-Remaining"))
+        reset = parse_number(headers.get("X-RateLimit-Requests-Reset"))
+        if limit is not None:
+            self.limit = int(limit)
+        if remaining is None:
+            return
+        self.remaining = int(remaining)
+        if reset:
+            budget = remaining / reset * self.headroom
+            self.bucket.rate = max(self.min_rate, min(self.max_rate, budget))
+
+    def summary(self) -> str:
+        now = time.monotonic()
+        users = " ".join(
+            f"{user.username}={user.polls_per_second(now):.2f}/s"
+            + ("*" if self.weight(user, now) > 1 else "")
+            for user in self.users.values()
+        )
+        return (
+            f"rate={self.bucket.rate:.2f}/s remaining={self.remaining} "
+            f"limit={self.limit} throttled={self.throttled} [{users}]"
+        )
+
+
+def parse_number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
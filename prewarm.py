@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LOGGER: logging.Logger = logging.getLogger("prewarm")
+
+PREWARM_INTERVAL: float = float(os.getenv("PREWARM_INTERVAL", "30"))
+PREWARM_TIMEOUT: float = float(os.getenv("PREWARM_TIMEOUT", "5"))
+
+Ping = Callable[[], Awaitable[object]]
+
+
+@dataclass
+class WarmState:
+    name: str
+    ping: Ping
+    interval: float
+    warm: bool = False
+    pings: int = 0
+    failures: int = 0
+    last_latency: float = 0.0
+    last_ok_at: float = 0.0
+    next_at: float = 0.0
+    error: str = ""
+
+    def describe(self) -> str:
+        if self.warm:
+            return f"{self.name}=warm({self.last_latency * 1000:.0f}ms)"
+        if not self.pings:
+            return f"{self.name}=pending"
+        return f"{self.name}=cold({self.error})"
+
+
+class Prewarmer:
+    def __init__(self, timeout: float = PREWARM_TIMEOUT) -> None:
+        self.timeout = timeout
+        self.targets: Dict[str, WarmState] = {}
+        self.task: Optional[asyncio.Task] = None
+        self.wakeup = asyncio.Event()
+
+    def add(self, name: str, ping: Ping, interval: float = PREWARM_INTERVAL) -> None:
+        self.targets[name] = WarmState(name, ping, interval)
+        self.wakeup.set()
+        self.start()
+
+    def remove(self, name: str) -> None:
+        self.targets.pop(name, None)
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def ping(self, state: WarmState) -> None:
+        started_at = time.monotonic()
+        state.pings += 1
+        try:
+            await asyncio.wait_for(state.ping(), self.timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if state.warm or state.failures == 0:
+                LOGGER.warning(f"{state.name} is cold: {e!r}")
+            state.warm = False
+            state.failures += 1
+            state.error = type(e).__name__
+        else:
+            if not state.warm:
+                LOGGER.info(f"{state.name} is warm")
+            state.warm = True
+            state.last_ok_at = time.monotonic()
+            state.last_latency = state.last_ok_at - started_at
+        state.next_at = time.monotonic() + state.interval
+
+    async def run(self) -> None:
+        while True:
+            now = time.monotonic()
+            due = [state for state in self.targets.values() if state.next_at <= now]
+            if due:
+                await asyncio.gather(*[self.ping(state) for state in due])
+                continue
+            self.wakeup.clear()
+            delay = min((s.next_at for s in self.targets.values()), default=now + 60)
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), delay - now)
+            except asyncio.TimeoutError:
+                pass
+
+    def cold(self) -> List[str]:
+        return [state.name for state in self.targets.values() if not state.warm]
+
+    def summary(self) -> str:
+        return " ".join(state.describe() for state in self.targets.values())
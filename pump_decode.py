@@ -0,0 +1,98 @@
+import base64
+import hashlib
+import struct
+from typing import Optional, Tuple
+import base58
+from solders.pubkey import Pubkey  # type: ignore
+
+CREATE_EVENT_DISCRIMINATOR: bytes = hashlib.sha256(b"event:CreateEvent").digest()[:8]
+MAX_STRING_LENGTH: int = 1024
+PUBKEY_LENGTH: int = 32
+
+U32 = struct.Struct("<I")
+
+
+def read_string_span(view: memoryview, offset: int) -> Tuple[int, int]:
+    if offset + U32.size > len(view):
+        raise ValueError(f"Truncated length prefix at offset {offset}")
+    (length,) = U32.unpack_from(view, offset)
+    if length > MAX_STRING_LENGTH:
+        raise ValueError(f"String length {length} at offset {offset} is too large")
+    start = offset + U32.size
+    end = start + length
+    if end > len(view):
+        raise ValueError(
+            f"String length {length} at offset {offset} exceeds buffer of {len(view)}"
+        )
+    return start, end
+
+
+def read_name_symbol_uri(
+    view: memoryview, offset: int
+) -> Tuple[str, str, Tuple[int, int]]:
+    name_start, name_end = read_string_span(view, offset)
+    symbol_start, symbol_end = read_string_span(view, name_end)
+    uri_span = read_string_span(view, symbol_end)
+    name = str(view[name_start:name_end], "utf-8")
+    symbol = str(view[symbol_start:symbol_end], "utf-8")
+    return name, symbol, uri_span
+
+
+class MetadataView:
+    __slots__ = ("view", "key", "name", "symbol", "uri_span")
+
+    def __init__(self, data: bytes) -> None:
+        self.view = memoryview(data)
+        if not self.view:
+            raise ValueError("Empty metadata buffer")
+        self.key = self.view[0]
+        self.name, self.symbol, self.uri_span = read_name_symbol_uri(self.view, 1)
+
+    @property
+    def uri(self) -> str:
+        start, end = self.uri_span
+        return str(self.view[start:end], "utf-8")
+
+
+class CreateEventView:
+    __slots__ = ("view", "name", "symbol", "uri_span")
+
+    def __init__(self, data: bytes) -> None:
+        self.view = memoryview(data)
+        self.name, self.symbol, self.uri_span = read_name_symbol_uri(
+            self.view, len(CREATE_EVENT_DISCRIMINATOR)
+        )
+        if self.uri_span[1] + 3 * PUBKEY_LENGTH > len(self.view):
+            raise ValueError("Truncated create event accounts")
+
+    @property
+    def uri(self) -> str:
+        start, end = self.uri_span
+        return str(self.view[start:end], "utf-8")
+
+    def pubkey_at(self, index: int) -> Pubkey:
+        start = self.uri_span[1] + index * PUBKEY_LENGTH
+        return Pubkey.from_bytes(self.view[start : start + PUBKEY_LENGTH].tobytes())
+
+    @property
+    def mint(self) -> str:
+        return str(self.pubkey_at(0))
+
+    @property
+    def bonding_curve(self) -> str:
+        return str(self.pubkey_at(1))
+
+    @property
+    def user(self) -> str:
+        return str(self.pubkey_at(2))
+
+
+def decode_metadata(data_base58: str) -> MetadataView:
+    return MetadataView(base58.b58decode(data_base58))
+
+
+def decode_create_event(data_base64: str) -> Optional[CreateEventView]:
+    event_bytes = base64.b64decode(data_base64)
+    if event_bytes[: len(CREATE_EVENT_DISCRIMINATOR)] != CREATE_EVENT_DISCRIMINATOR:
+        return None
+    return CreateEventView(event_bytes)
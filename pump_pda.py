@@ -0,0 +1,163 @@
+import argparse
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from solders.pubkey import Pubkey  # type: ignore
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PUMP_PROGRAM: Pubkey = Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P")
+TOKEN_PROGRAM: Pubkey = Pubkey.from_string(
+    "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+)
+ASSOCIATED_TOKEN_PROGRAM: Pubkey = Pubkey.from_string(
+    "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL"
+)
+BONDING_CURVE_SEED: bytes = b"bonding-curve"
+TOKEN_PROGRAM_SEED: bytes = bytes(TOKEN_PROGRAM)
+
+PDA_CACHE_SIZE: int = int(os.getenv("PDA_CACHE_SIZE", "65536"))
+
+
+class CurveAccounts(NamedTuple):
+    bonding_curve: Pubkey
+    associated_bonding_curve: Pubkey
+
+
+class LRUCache(OrderedDict):
+    def __init__(self, max_size: int) -> None:
+        super().__init__()
+        self.max_size = max_size
+
+    def lookup(self, key: str) -> Optional[object]:
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def store(self, key: str, value: object) -> None:
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+BONDING_CURVES: LRUCache = LRUCache(PDA_CACHE_SIZE)
+CURVE_ACCOUNTS: LRUCache = LRUCache(PDA_CACHE_SIZE)
+
+
+def find_bonding_curve(mint: Pubkey) -> Pubkey:
+    pda, _ = Pubkey.find_program_address(
+        [BONDING_CURVE_SEED, bytes(mint)], PUMP_PROGRAM
+    )
+    return pda
+
+
+def find_associated_bonding_curve(mint: Pubkey, bonding_curve: Pubkey) -> Pubkey:
+    pda, _ = Pubkey.find_program_address(
+        [bytes(bonding_curve), TOKEN_PROGRAM_SEED, bytes(mint)],
+        ASSOCIATED_TOKEN_PROGRAM,
+    )
+    return pda
+
+
+def derive_bonding_curve(mint: str) -> Pubkey:
+    bonding_curve = BONDING_CURVES.lookup(mint)
+    if bonding_curve is None:
+        bonding_curve = find_bonding_curve(Pubkey.from_string(mint))
+        BONDING_CURVES.store(mint, bonding_curve)
+    return bonding_curve  # type: ignore
+
+
+def derive_curve_accounts(mint: str) -> CurveAccounts:
+    accounts = CURVE_ACCOUNTS.lookup(mint)
+    if accounts is None:
+        bonding_curve = derive_bonding_curve(mint)
+        accounts = CurveAccounts(
+            bonding_curve,
+            find_associated_bonding_curve(Pubkey.from_string(mint), bonding_curve),
+        )
+        CURVE_ACCOUNTS.store(mint, accounts)
+    return accounts  # type: ignore
+
+
+def get_pair(mint: str) -> str:
+    return str(derive_bonding_curve(mint))
+
+
+def derive_chunk(mints: List[str]) -> List[Tuple[str, bytes, bytes]]:
+    results = []
+    for mint in mints:
+        mint_key = Pubkey.from_string(mint)
+        bonding_curve = find_bonding_curve(mint_key)
+        associated = find_associated_bonding_curve(mint_key, bonding_curve)
+        results.append((mint, bytes(bonding_curve), bytes(associated)))
+    return results
+
+
+def derive_many(
+    mints: Iterable[str], workers: Optional[int] = None, chunk_size: int = 512
+) -> Dict[str, CurveAccounts]:
+    pending = list(dict.fromkeys(mint for mint in mints if mint))
+    chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    results: Dict[str, CurveAccounts] = {}
+    if not chunks:
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in executor.map(derive_chunk, chunks):
+            for mint, bonding_curve, associated in chunk:
+                results[mint] = CurveAccounts(
+                    Pubkey.from_bytes(bonding_curve), Pubkey.from_bytes(associated)
+                )
+    return results
+
+
+def precompute(mints: Iterable[str], workers: Optional[int] = None) -> int:
+    missing = [mint for mint in mints if mint and mint not in CURVE_ACCOUNTS]
+    for mint, accounts in derive_many(missing, workers).items():
+        BONDING_CURVES.store(mint, accounts.bonding_curve)
+        CURVE_ACCOUNTS.store(mint, accounts)
+    return len(missing)
+
+
+def read_mints(path: str) -> List[str]:
+    with open(path, "r") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Derive pump bonding curve accounts for a list of mints."
+    )
+    parser.add_argument("mints_file", help="File with one mint address per line")
+    parser.add_argument(
+        "-o", "--output", default="pdas.csv", help="Output CSV (default: pdas.csv)"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Worker processes"
+    )
+    args = parser.parse_args()
+
+    mints = read_mints(args.mints_file)
+    started_at = time.perf_counter()
+    results = derive_many(mints, args.workers)
+    elapsed = time.perf_counter() - started_at
+
+    with open(args.output, "w") as f:
+        f.write("mint,bonding_curve,associated_bonding_curve\n")
+        for mint, accounts in results.items():
+            f.write(
+                f"{mint},{accounts.bonding_curve},{accounts.associated_bonding_curve}\n"
+            )
+    print(
+        f"Derived {len(results)} mints in {elapsed:.2f}s "
+        f"({len(results) / elapsed if elapsed else 0:.0f} mints/s) -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
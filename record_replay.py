@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+from typing import IO, Any, Dict, Iterator, List, NamedTuple, Optional
+import aiohttp
+from aiohttp import web
+from dotenv import load_dotenv
+from mock_solana import MockSolana, serve
+from rpc_hedge import rpc_url, ws_url
+
+load_dotenv()
+
+PUMP_PROGRAM: str = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+CREATE_LOG: str = "Program log: Instruction: Create"
+RPC: str = os.getenv("RPC", "")
+
+FRAME: str = "ws"
+TRANSACTION: str = "tx"
+
+
+class Record(NamedTuple):
+    offset: float
+    kind: str
+    key: str
+    payload: str
+
+
+def compact(raw: str) -> str:
+    return json.dumps(json.loads(raw), separators=(",", ":"))
+
+
+def open_recording(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore
+    return open(path, mode, encoding="utf-8")
+
+
+def write_record(f: IO[str], record: Record) -> None:
+    f.write(f"{record.offset:.6f}\t{record.kind}\t{record.key}\t{record.payload}\n")
+
+
+def read_records(path: str) -> Iterator[Record]:
+    with open_recording(path, "r") as f:
+        for line in f:
+            offset, kind, key, payload = line.rstrip("\n").split("\t", 3)
+            yield Record(float(offset), kind, key, payload)
+
+
+def last_offset(path: str) -> float:
+    if not os.path.exists(path):
+        return 0.0
+    return max((record.offset for record in read_records(path)), default=0.0)
+
+
+async def fetch_raw_transaction(
+    session: aiohttp.ClientSession, url: str, signature: str, attempts: int = 20
+) -> Optional[str]:
+    body = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "getTransaction",
+        "params": [
+            signature,
+            {
+                "encoding": "jsonParsed",
+                "commitment": "confirmed",
+                "maxSupportedTransactionVersion": 0,
+            },
+        ],
+    }
+    for _ in range(attempts):
+        async with session.post(url, json=body) as response:
+            data = await response.json(content_type=None)
+        if data.get("result") is not None:
+            return json.dumps(data["result"], separators=(",", ":"))
+        await asyncio.sleep(0.25)
+    return None
+
+
+async def record(
+    output: str, http_url: str, ws_endpoint: str, creates_only: bool, limit: int
+) -> None:
+    # Appended sessions continue the timeline, so replay paces them back to back
+    base_offset = last_offset(output)
+    started_at = time.monotonic()
+    frames = 0
+    creates = 0
+    pending: List[asyncio.Task] = []
+
+    async with aiohttp.ClientSession() as session:
+        with open_recording(output, "a") as f:
+
+            async def capture_transaction(signature: str) -> None:
+                raw = await fetch_raw_transaction(session, http_url, signature)
+                if raw is None:
+                    print(f"Transaction {signature} was never returned")
+                    return
+                offset = base_offset + time.monotonic() - started_at
+                write_record(f, Record(offset, TRANSACTION, signature, raw))
+
+            async with session.ws_connect(ws_endpoint, max_msg_size=0) as websocket:
+                await websocket.send_json(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": 1,
+                        "method": "logsSubscribe",
+                        "params": [
+                            {"mentions": [PUMP_PROGRAM]},
+                            {"commitment": "confirmed"},
+                        ],
+                    }
+                )
+                print(f"Recording {ws_endpoint} to {output}...")
+                try:
+                    async for message in websocket:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            continue
+                        data = json.loads(message.data)
+                        value = data.get("params", {}).get("result", {}).get("value")
+                        if value is None:
+                            continue
+                        is_create = CREATE_LOG in value["logs"] and not value["err"]
+                        if creates_only and not is_create:
+                            continue
+                        offset = base_offset + time.monotonic() - started_at
+                        write_record(
+                            f,
+                            Record(
+                                offset, FRAME, value["signature"], compact(message.data)
+                            ),
+                        )
+                        frames += 1
+                        if is_create:
+                            creates += 1
+                            pending.append(
+                                asyncio.create_task(
+                                    capture_transaction(value["signature"])
+                                )
+                            )
+                        if limit and frames >= limit:
+                            break
+                finally:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed = time.monotonic() - started_at
+    print(f"Recorded {frames} frames ({creates} creates) in {elapsed:.1f}s")
+
+
+class ReplayServer(MockSolana):
+    def __init__(self, records: List[Record], speed: float, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.recorded_frames = [r for r in records if r.kind == FRAME]
+        self.transactions: Dict[str, str] = {
+            r.key: r.payload for r in records if r.kind == TRANSACTION
+        }
+        self.speed = speed
+        self.transaction_misses = 0
+
+    async def get_transaction(self, params: List) -> Optional[Dict]:
+        raw = self.transactions.get(params[0])
+        if raw is None:
+            self.transaction_misses += 1
+            return None
+        return json.loads(raw)
+
+    async def get_signatures_for_address(self, params: List) -> List[Dict]:
+        return []
+
+    async def on_subscribe(
+        self, websocket: web.WebSocketResponse, subscription: int
+    ) -> None:
+        asyncio.create_task(self.stream(websocket, subscription))
+
+    async def stream(self, websocket: web.WebSocketResponse, subscription: int) -> None:
+        started_at = time.monotonic()
+        first_offset = self.recorded_frames[0].offset if self.recorded_frames else 0.0
+        sent = 0
+        for frame in self.recorded_frames:
+            if self.speed > 0:
+                due = (frame.offset - first_offset) / self.speed
+                delay = due - (time.monotonic() - started_at)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if websocket.closed:
+                break
+            data = json.loads(frame.payload)
+            data["params"]["subscription"] = subscription
+            await websocket.send_str(json.dumps(data, separators=(",", ":")))
+            sent += 1
+            self.frames += 1
+        elapsed = time.monotonic() - started_at
+        rate = sent / elapsed if elapsed else 0
+        print(f"Replayed {sent} frames in {elapsed:.2f}s ({rate:.0f} frames/s)")
+
+    def summary(self) -> str:
+        return f"{super().summary()} transaction_misses={self.transaction_misses}"
+
+
+async def replay(
+    path: str, host: str, port: int, speed: float, latency: float, jitter: float
+) -> None:
+    server = ReplayServer(
+        list(read_records(path)), speed, latency=latency, jitter=jitter
+    )
+    print(
+        f"Replaying {len(server.recorded_frames)} frames and "
+        f"{len(server.transactions)} transactions"
+    )
+    await serve(server, host, port)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Record and replay pump program log streams."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Record a live stream")
+    record_parser.add_argument("output", help="Recording file (.gz to compress)")
+    record_parser.add_argument("--rpc", default=RPC, help="RPC host (default: $RPC)")
+    record_parser.add_argument(
+        "--creates-only", action="store_true", help="Only keep Create frames"
+    )
+    record_parser.add_argument(
+        "--limit", type=int, default=0, help="Stop after this many frames"
+    )
+
+    replay_parser = subparsers.add_parser("replay", help="Serve a recording")
+    replay_parser.add_argument("input", help="Recording file")
+    replay_parser.add_argument("--host", default="127.0.0.1")
+    replay_parser.add_argument("--port", type=int, default=8899)
+    replay_parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Pacing multiplier; 0 replays as fast as possible (default: 1)",
+    )
+    replay_parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added per RPC request"
+    )
+    replay_parser.add_argument(
+        "--jitter", type=float, default=0.0, help="+/- seconds of RPC latency"
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.command == "record":
+            asyncio.run(
+                record(
+                    args.output,
+                    rpc_url(args.rpc),
+                    ws_url(args.rpc),
+                    args.creates_only,
+                    args.limit,
+                )
+            )
+        else:
+            asyncio.run(
+                replay(
+                    args.input,
+                    args.host,
+                    args.port,
+                    args.speed,
+                    args.latency,
+                    args.jitter,
+                )
+            )
+    except KeyboardInterrupt:
+        print("Exiting...")
+
+
+if __name__ == "__main__":
+    main()
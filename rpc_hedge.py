@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+from solana.rpc.async_api import AsyncClient
+
+LOGGER: logging.Logger = logging.getLogger("rpc_hedge")
+
+T = TypeVar("T")
+
+
+def rpc_url(endpoint: str) -> str:
+    return endpoint if "://" in endpoint else f"https://{endpoint}"
+
+
+def ws_url(endpoint: str) -> str:
+    if endpoint.startswith("https://"):
+        return "wss://" + endpoint[len("https://") :]
+    if endpoint.startswith("http://"):
+        return "ws://" + endpoint[len("http://") :]
+    return endpoint if "://" in endpoint else f"wss://{endpoint}"
+
+
+@dataclass
+class EndpointStats:
+    url: str
+    ewma: float
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+    requests: int = 0
+    errors: int = 0
+    wins: int = 0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class HedgedClient:
+    def __init__(
+        self,
+        endpoints: List[str],
+        hedge_percentile: float = 0.9,
+        default_hedge_delay: float = 0.1,
+        min_hedge_delay: float = 0.01,
+        max_hedge_delay: float = 1.0,
+        min_samples: int = 10,
+        alpha: float = 0.2,
+        error_penalty: float = 1.0,
+        max_hedges: int = 1,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("At least one RPC endpoint is required")
+        self.clients = [AsyncClient(rpc_url(endpoint)) for endpoint in endpoints]
+        self.endpoints = [
+            EndpointStats(rpc_url(endpoint), default_hedge_delay)
+            for endpoint in endpoints
+        ]
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self.max_hedges = max_hedges
+        self.hedges = 0
+        self.failovers = 0
+
+    async def __aenter__(self) -> "HedgedClient":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await asyncio.gather(
+            *[client.close() for client in self.clients], return_exceptions=True
+        )
+
+    @property
+    def primary(self) -> AsyncClient:
+        return self.clients[self.ranked()[0]]
+
+    def ranked(self) -> List[int]:
+        return sorted(range(len(self.endpoints)), key=lambda i: self.endpoints[i].ewma)
+
+    def hedge_delay(self, index: int) -> float:
+        stats = self.endpoints[index]
+        if len(stats.samples) < self.min_samples:
+            return self.default_hedge_delay
+        delay = stats.percentile(self.hedge_percentile) or self.default_hedge_delay
+        return min(max(delay, self.min_hedge_delay), self.max_hedge_delay)
+
+    def record(self, index: int, latency: float, sample: bool = True) -> None:
+        stats = self.endpoints[index]
+        if sample:
+            stats.samples.append(latency)
+        stats.ewma = self.alpha * latency + (1 - self.alpha) * stats.ewma
+
+    async def timed(
+        self, index: int, request: Callable[[AsyncClient], Awaitable[T]]
+    ) -> T:
+        stats = self.endpoints[index]
+        stats.requests += 1
+        started_at = time.monotonic()
+        try:
+            response = await request(self.clients[index])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.errors += 1
+            self.record(index, self.error_penalty, sample=False)
+            raise
+        self.record(index, time.monotonic() - started_at)
+        return response
+
+    async def call(
+        self,
+        request: Callable[[AsyncClient], Awaitable[T]],
+        accept: Callable[[T], bool] = lambda _: True,
+    ) -> T:
+        order = self.ranked()
+        pending: Dict["asyncio.Task[T]", int] = {}
+        launched = 0
+        fallback: Optional[T] = None
+        fallback_index: Optional[int] = None
+        error: Optional[BaseException] = None
+
+        def launch() -> None:
+            nonlocal launched
+            index = order[launched]
+            launched += 1
+            pending[asyncio.create_task(self.timed(index, request))] = index
+
+        launch()
+        try:
+            while pending:
+                can_hedge = launched < min(len(order), 1 + self.max_hedges)
+                timeout = self.hedge_delay(order[0]) if can_hedge else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self.hedges += 1
+                    launch()
+                    continue
+                for task in done:
+                    index = pending.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        error = e
+                        LOGGER.warning(f"{self.endpoints[index].url} failed: {e}")
+                        continue
+                    if accept(response):
+                        self.endpoints[index].wins += 1
+                        return response
+                    if fallback_index is None:
+                        fallback, fallback_index = response, index
+                if not pending and fallback_index is None and launched < len(order):
+                    self.failovers += 1
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if fallback_index is not None:
+            self.endpoints[fallback_index].wins += 1
+            return fallback  # type: ignore
+        assert error is not None
+        raise error
+
+    async def ping(self, index: int) -> None:
+        if not await self.clients[index].is_connected():
+            raise ConnectionError(f"{self.endpoints[index].url} is unhealthy")
+
+    async def get_transaction(self, *args: Any, **kwargs: Any) -> Any:
+        return await self.call(
+            lambda client: client.get_transaction(*args, **kwargs),
+            lambda tx: tx.value is not None,
+        )
+
+    def summary(self) -> str:
+        endpoints = ", ".join(
+            f"{stats.url} ewma={stats.ewma * 1000:.0f}ms "
+            f"p90={(stats.percentile(0.9) or 0) * 1000:.0f}ms "
+            f"wins={stats.wins}/{stats.requests} errors={stats.errors}"
+            for stats in self.endpoints
+        )
+        return f"hedges={self.hedges} failovers={self.failovers} [{endpoints}]"
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, TypeVar
+
+LOGGER: logging.Logger = logging.getLogger("rpc_retry")
+
+T = TypeVar("T")
+
+
+@dataclass
+class RetryPolicy:
+    min_initial_delay: float = 0.05
+    max_initial_delay: float = 1.0
+    max_delay: float = 2.0
+    multiplier: float = 2.0
+    jitter: float = 0.2
+    deadline: float = 15.0
+    lag_alpha: float = 0.2
+    lag_fraction: float = 0.8
+
+
+@dataclass
+class RetryStats:
+    requests: int = 0
+    attempts: int = 0
+    successes: int = 0
+    errors: int = 0
+    abandoned: int = 0
+    indexing_lag: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"requests={self.requests} attempts={self.attempts} "
+            f"successes={self.successes} errors={self.errors} "
+            f"abandoned={self.abandoned} indexing_lag={self.indexing_lag * 1000:.0f}ms"
+        )
+
+
+class AdaptiveRetry:
+    def __init__(self, policy: Optional[RetryPolicy] = None) -> None:
+        self.policy = policy or RetryPolicy()
+        self.stats = RetryStats(indexing_lag=self.policy.max_initial_delay / 2)
+
+    def initial_delay(self) -> float:
+        delay = self.stats.indexing_lag * self.policy.lag_fraction
+        return min(
+            max(delay, self.policy.min_initial_delay), self.policy.max_initial_delay
+        )
+
+    def backoff_delay(self, attempt: int) -> float:
+        delay = self.policy.min_initial_delay * self.policy.multiplier**attempt
+        delay = min(delay, self.policy.max_delay)
+        return delay * random.uniform(1 - self.policy.jitter, 1 + self.policy.jitter)
+
+    def record_lag(self, lag: float) -> None:
+        alpha = self.policy.lag_alpha
+        self.stats.indexing_lag = alpha * lag + (1 - alpha) * self.stats.indexing_lag
+
+    async def run(
+        self,
+        fetch: Callable[[], Awaitable[Optional[T]]],
+        label: str,
+        seen_at: Optional[float] = None,
+    ) -> Optional[T]:
+        seen_at = seen_at if seen_at is not None else time.monotonic()
+        deadline_at = seen_at + self.policy.deadline
+        self.stats.requests += 1
+
+        delay = self.initial_delay() - (time.monotonic() - seen_at)
+        attempt = 0
+        while True:
+            if delay > 0:
+                if time.monotonic() + delay >= deadline_at:
+                    break
+                await asyncio.sleep(delay)
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+            self.stats.attempts += 1
+            sent_at = time.monotonic()
+            try:
+                result = await asyncio.wait_for(fetch(), remaining)
+            except asyncio.TimeoutError:
+                attempt += 1
+                break
+            except Exception as e:
+                self.stats.errors += 1
+                LOGGER.warning(f"Fetching {label} failed: {e}")
+                result = None
+            if result is not None:
+                self.stats.successes += 1
+                # Lag ends before the successful send, not at its response. A first
+                # attempt hit only bounds it from above, so drift down to the floor
+                self.record_lag(
+                    sent_at - seen_at if attempt else self.policy.min_initial_delay
+                )
+                return result
+            delay = self.backoff_delay(attempt)
+            attempt += 1
+
+        self.stats.abandoned += 1
+        LOGGER.warning(
+            f"Abandoned {label} after {attempt} attempts "
+            f"({time.monotonic() - seen_at:.2f}s)"
+        )
+        return None
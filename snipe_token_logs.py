@@ -1,13 +1,15 @@
 import asyncio
+import functools
 from dotenv import load_dotenv
 import socketio  # type: ignore
-import subprocess
 import os
-from typing import Optional
+import time
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
 from solana.rpc.types import Commitment
 from aiohttp import ClientSession
-from solana.rpc.async_api import AsyncClient
-from solana.rpc.websocket_api import connect as ws_connect # type: ignore
+from solana.rpc.websocket_api import connect as ws_connect  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
 from solders.signature import Signature  # type: ignore
 from solders.transaction_status import (  # type: ignore
@@ -20,61 +22,90 @@ from solders.rpc.responses import GetTransactionResp  # type: ignore
 from solders.rpc.config import RpcTransactionLogsFilterMentions  # type: ignore
 from spl.token.constants import TOKEN_PROGRAM_ID
 import logging
-import base58
-from construct import Struct, Int8ul, Int32ul, Bytes, GreedyBytes # type: ignore
+from pump_decode import CreateEventView, decode_create_event, decode_metadata
+from rpc_retry import AdaptiveRetry, RetryPolicy
+from rpc_hedge import HedgedClient, ws_url
+from latency import Trace, install as install_latency, mark, start_trace
+from pump_pda import PUMP_PROGRAM, precompute, read_mints
+from sniper import (
+    MATCHED,
+    PREWARMER,
+    SEEN,
+    WATCHLIST,
+    finish,
+    on_match,
+    run_until_matched,
+    start_actions,
+    wait_for_actions,
+)
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 LOGGER: logging.Logger = logging.getLogger("snipe_token")
 
 
-NAME: str = "TESTBABA"
-TICKER: str = "BABUN"
+PRECOMPUTE_MINTS_FILE: str = os.getenv("PRECOMPUTE_MINTS_FILE", "")
 
 
 SIO: socketio.AsyncClient = socketio.AsyncClient()
 RPC: str = os.getenv("RPC", "")
-MINT: Optional[str] = None
-PAIR: Optional[str] = None
+RPC_ENDPOINTS: List[str] = [
+    endpoint.strip()
+    for endpoint in os.getenv("RPCS", RPC).split(",")
+    if endpoint.strip()
+]
 SUBSCRIPTION_ID: Optional[int] = None
 
-DESKTOP_PATH: str = os.path.join(os.path.expanduser("~"), "Desktop")
-DIR: str = os.path.join(DESKTOP_PATH, "scripts", "solana-bots")
-FILE_NAME: str = "pair.txt"
-FILE_PATH: str = os.path.join(DIR, FILE_NAME)
-
-try:
-    os.makedirs(DIR, exist_ok=True)
-except Exception as e:
-    print(f"Error creating directory: {e}")
-    exit(1)
+PIPELINE: bool = os.getenv("PIPELINE", "true").lower() == "true"
+PIPELINE_WORKERS: int = int(os.getenv("PIPELINE_WORKERS", "8"))
+PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "256"))
+DECODE_LOG_EVENTS: bool = os.getenv("DECODE_LOG_EVENTS", "true").lower() == "true"
+PIPELINE_STATS_INTERVAL: float = float(os.getenv("PIPELINE_STATS_INTERVAL", "10"))
 
-SCRIPT_PATH = os.path.join(
-    DESKTOP_PATH, "scripts", "solana-bots", "scripts", "!1open-all-profiles-test.scpt"
+BACKFILL_ADDRESS: Pubkey = Pubkey.from_string(
+    os.getenv("BACKFILL_ADDRESS", "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM")
 )
-COMMAND = ["osascript", SCRIPT_PATH]
-
-METADATA_SCHEMA = Struct(
-    "key" / Int8ul,
-    "name_length" / Int32ul,
-    "name" / Bytes(lambda this: this.name_length),
-    "symbol_length" / Int32ul,
-    "symbol" / Bytes(lambda this: this.symbol_length),
-    "uri_length" / Int32ul,
-    "uri" / Bytes(lambda this: this.uri_length),
-    "other" / GreedyBytes,
+BACKFILL_PAGE_SIZE: int = 1000
+BACKFILL_LIMIT: int = int(os.getenv("BACKFILL_LIMIT", "5000"))
+RECONNECT_MIN_DELAY: float = float(os.getenv("RECONNECT_MIN_DELAY", "0.5"))
+RECONNECT_MAX_DELAY: float = float(os.getenv("RECONNECT_MAX_DELAY", "30"))
+PREWARM_RPC_INTERVAL: float = float(os.getenv("PREWARM_RPC_INTERVAL", "4"))
+PUMP_API_URL: str = "https://frontend-api.pump.fun"
+
+TX_RETRY: AdaptiveRetry = AdaptiveRetry(
+    RetryPolicy(
+        min_initial_delay=float(os.getenv("TX_RETRY_MIN_DELAY", "0.05")),
+        max_initial_delay=float(os.getenv("TX_RETRY_MAX_INITIAL_DELAY", "1.0")),
+        max_delay=float(os.getenv("TX_RETRY_MAX_DELAY", "2.0")),
+        deadline=float(os.getenv("TX_RETRY_DEADLINE", "15")),
+    )
 )
 
-
-def deserialize_metadata(data_base58: str) -> tuple:
-    metadata_bytes = base58.b58decode(data_base58)
-    metadata = METADATA_SCHEMA.parse(metadata_bytes)
-
-    name = metadata.name.decode("utf-8")
-    symbol = metadata.symbol.decode("utf-8")
-    uri = metadata.uri.decode("utf-8")
-
-    return name, symbol, uri
+PROGRAM_DATA_PREFIX: str = "Program data: "
+PUMP_PROGRAM_ID: str = str(PUMP_PROGRAM)
+
+
+def find_create_event(logs: List[str]) -> Optional[CreateEventView]:
+    invoked: List[str] = []  # Program ids of the open invocations, innermost last
+    for line in logs:
+        if not line.startswith(PROGRAM_DATA_PREFIX):
+            words = line.split(" ", 3)
+            if len(words) >= 3 and words[0] == "Program":
+                if words[2] == "invoke":
+                    invoked.append(words[1])
+                elif words[2] in ("success", "failed:") and invoked:
+                    invoked.pop()
+            continue
+        if not invoked or invoked[-1] != PUMP_PROGRAM_ID:
+            continue  # Only pump itself can emit a genuine CreateEvent
+        try:
+            event = decode_create_event(line[len(PROGRAM_DATA_PREFIX) :])
+        except Exception as e:
+            LOGGER.warning(f"Failed to decode program data: {e}")
+            continue
+        if event:
+            return event
+    return None
 
 
 def find_instruction_by_program_id(
@@ -94,53 +125,379 @@ def find_instruction_by_program_id(
     return None
 
 
-async def process_log(client: AsyncClient, log: dict) -> bool:
-    global MINT
+QueueItem = Tuple[Signature, float, Optional[Trace]]
+
+NULL_SIGNATURE: Signature = Signature.from_string(
+    "1111111111111111111111111111111111111111111111111111111111111111"
+)
+
+
+@dataclass
+class PipelineStats:
+    enqueued: int = 0
+    processed: int = 0
+    failed: int = 0
+    max_depth: int = 0
+    backpressure_events: int = 0
+    backpressure_time: float = 0.0
+    queue_wait_time: float = 0.0
+    decoded_from_logs: int = 0
+
+    def summary(self, depth: int) -> str:
+        avg_wait = self.queue_wait_time / self.processed if self.processed else 0.0
+        return (
+            f"depth={depth} max_depth={self.max_depth} "
+            f"decoded_from_logs={self.decoded_from_logs} enqueued={self.enqueued} "
+            f"processed={self.processed} failed={self.failed} "
+            f"backpressure={self.backpressure_events} "
+            f"({self.backpressure_time:.3f}s blocked) avg_wait={avg_wait * 1000:.1f}ms"
+        )
 
+
+@dataclass
+class SubscriptionStats:
+    connects: int = 0
+    reconnects: int = 0
+    gaps: int = 0
+    last_gap: int = 0
+    largest_gap: int = 0
+    backfilled: int = 0
+    last_slot: Optional[int] = None
+
+    def track(self, log: List) -> None:
+        slot = log[0].result.context.slot
+        if self.last_slot is None or slot > self.last_slot:
+            self.last_slot = slot
+
+    def summary(self) -> str:
+        return (
+            f"connects={self.connects} reconnects={self.reconnects} "
+            f"gaps={self.gaps} last_gap={self.last_gap} "
+            f"largest_gap={self.largest_gap} backfilled={self.backfilled} "
+            f"last_slot={self.last_slot}"
+        )
+
+
+def get_create_signature(log: List) -> Optional[Signature]:
     value = log[0].result.value
     if value.err:
+        return None
+    if "Program log: Instruction: Create" not in value.logs:
+        return None
+    if value.signature == NULL_SIGNATURE:
+        return None
+    if SEEN.seen(value.signature):
+        return None
+    return value.signature
+
+
+def get_mint(transaction: UiTransaction) -> Optional[str]:
+    pubkeys_parsed = transaction.message.account_keys
+    if isinstance(pubkeys_parsed[1], Pubkey):
+        return str(pubkeys_parsed[1])
+    elif isinstance(pubkeys_parsed[1], ParsedAccount):
+        return str(pubkeys_parsed[1].pubkey)
+    return None
+
+
+async def fetch_transaction(
+    client: HedgedClient, sig: Signature, seen_at: Optional[float] = None
+) -> Optional[GetTransactionResp]:
+    async def fetch() -> Optional[GetTransactionResp]:
+        tx = await client.get_transaction(sig, "jsonParsed", Commitment("confirmed"), 0)
+        return tx if tx.value is not None else None
+
+    return await TX_RETRY.run(fetch, f"transaction {sig}", seen_at)
+
+
+async def process_signature(
+    client: HedgedClient,
+    sig: Signature,
+    seen_at: Optional[float] = None,
+    trace: Optional[Trace] = None,
+) -> bool:
+    tx = await fetch_transaction(client, sig, seen_at)
+    if tx is None:
         return False
-    if "Program log: Instruction: Create" in value.logs:
-        sig = value.signature
-        if sig == Signature.from_string(
-            "1111111111111111111111111111111111111111111111111111111111111111"
-        ):
+    mark(trace, "tx_fetched")
+    if (
+        tx.value
+        and tx.value.transaction
+        and isinstance(tx.value.transaction.transaction, UiTransaction)
+    ):
+        print(f"Found the create token tx: {sig}")
+        mint = get_mint(tx.value.transaction.transaction)
+        if mint is None or SEEN.seen(mint):
             return False
-        await asyncio.sleep(0.5)
-        tx = GetTransactionResp(None)
-        while True:
-            tx = await client.get_transaction(
-                sig, "jsonParsed", Commitment("confirmed"), 0
-            )
-            if tx != GetTransactionResp(None):
-                break
-            else:
-                LOGGER.warning(f"Failed to get transaction {sig}, retrying...")
-                await asyncio.sleep(0.5)
-        if (
-            tx.value
-            and tx.value.transaction
-            and isinstance(tx.value.transaction.transaction, UiTransaction)
-        ):
-            print(f"Found the create token tx: {sig}")
-            instruction_data = find_instruction_by_program_id(
-                tx.value.transaction,
-                Pubkey.from_string("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"),
+        instruction_data = find_instruction_by_program_id(
+            tx.value.transaction,
+            Pubkey.from_string("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"),
+        )
+        if instruction_data:
+            metadata = decode_metadata(instruction_data)
+            name, symbol = metadata.name, metadata.symbol
+            mark(trace, "metadata_decoded")
+            print(f"CHECKING Token: {name} | Ticker: {symbol} (Program Logs)")
+            entry = WATCHLIST.match(name, symbol)
+            if entry:
+                mark(trace, "match")
+                if on_match(mint, trace, "program_logs"):
+                    print(f"PROGRAM LOGS: Found the token {mint} (matched {entry})")
+                return True
+    return False
+
+
+def process_log_event(log: List, trace: Optional[Trace] = None) -> Optional[bool]:
+    if not DECODE_LOG_EVENTS:
+        return None
+    event = find_create_event(log[0].result.value.logs)
+    if event is None:
+        return None
+    if SEEN.seen(event.mint):
+        return False
+    mark(trace, "metadata_decoded")
+    print(f"CHECKING Token: {event.name} | Ticker: {event.symbol} (Program Data)")
+    entry = WATCHLIST.match(event.name, event.symbol)
+    if entry:
+        mark(trace, "match")
+        if on_match(event.mint, trace, "program_logs"):
+            print(f"PROGRAM DATA: Found the token {event.mint} (matched {entry})")
+        return True
+    return False
+
+
+async def process_log(
+    client: HedgedClient, log: List, trace: Optional[Trace] = None
+) -> bool:
+    sig = get_create_signature(log)
+    if sig is None:
+        return False
+    mark(trace, "log_filter_hit")
+    matched = process_log_event(log, trace)
+    if matched is not None:
+        return matched
+    return await process_signature(client, sig, trace=trace)
+
+
+async def enqueue_signature(
+    queue: "asyncio.Queue[QueueItem]",
+    stats: PipelineStats,
+    sig: Signature,
+    trace: Optional[Trace] = None,
+) -> None:
+    item = (sig, time.monotonic(), trace)
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        stats.backpressure_events += 1
+        blocked_at = time.monotonic()
+        await queue.put(item)
+        stats.backpressure_time += time.monotonic() - blocked_at
+    stats.enqueued += 1
+    stats.max_depth = max(stats.max_depth, queue.qsize())
+
+
+async def read_logs(
+    websocket,
+    queue: "asyncio.Queue[QueueItem]",
+    found: asyncio.Event,
+    stats: PipelineStats,
+    subscription: SubscriptionStats,
+) -> None:
+    async for log in websocket:
+        trace = start_trace("program_logs")
+        subscription.track(log)
+        sig = get_create_signature(log)
+        if sig is None:
+            continue
+        mark(trace, "log_filter_hit")
+        matched = process_log_event(log, trace)
+        if matched is not None:
+            stats.decoded_from_logs += 1
+            if matched:
+                found.set()
+                return
+            continue
+        await enqueue_signature(queue, stats, sig, trace)
+
+
+async def pipeline_worker(
+    client: HedgedClient,
+    queue: "asyncio.Queue[QueueItem]",
+    found: asyncio.Event,
+    stats: PipelineStats,
+) -> None:
+    while True:
+        sig, enqueued_at, trace = await queue.get()
+        stats.queue_wait_time += time.monotonic() - enqueued_at
+        try:
+            if await process_signature(client, sig, enqueued_at, trace):
+                found.set()
+        except Exception as e:
+            stats.failed += 1
+            LOGGER.error(f"Failed to process transaction {sig}: {e}")
+        finally:
+            stats.processed += 1
+            queue.task_done()
+
+
+async def report_pipeline_stats(
+    client: HedgedClient,
+    queue: "asyncio.Queue[QueueItem]",
+    stats: PipelineStats,
+    subscription: SubscriptionStats,
+) -> None:
+    while True:
+        await asyncio.sleep(PIPELINE_STATS_INTERVAL)
+        LOGGER.info(f"Pipeline: {stats.summary(queue.qsize())}")
+        LOGGER.info(f"Subscription: {subscription.summary()}")
+        LOGGER.info(f"Seen cache: {SEEN.summary()}")
+        LOGGER.info(f"Transaction fetches: {TX_RETRY.stats.summary()}")
+        LOGGER.info(f"RPC endpoints: {client.summary()}")
+        LOGGER.info(f"Connections: {PREWARMER.summary()}")
+
+
+async def backfill_gap(
+    client: HedgedClient,
+    since_slot: int,
+    handle_signature: Callable[[Signature], Awaitable[None]],
+    stats: SubscriptionStats,
+) -> None:
+    statuses: List = []
+    before: Optional[Signature] = None
+    while len(statuses) < BACKFILL_LIMIT:
+        resp = await client.call(
+            lambda c: c.get_signatures_for_address(
+                BACKFILL_ADDRESS,
+                before=before,
+                limit=BACKFILL_PAGE_SIZE,
+                commitment=Commitment("confirmed"),
             )
-            if instruction_data:
-                name, symbol, _ = deserialize_metadata(instruction_data)
-                print(f"CHECKING Token: {name} | Ticker: {symbol} (Program Logs)")
-                if name.lower() == NAME.lower() and symbol.lower() == TICKER.lower():
-                    pubkeys_parsed = (
-                        tx.value.transaction.transaction.message.account_keys
+        )
+        batch = [status for status in resp.value if status.slot >= since_slot]
+        statuses.extend(batch)
+        if len(batch) < BACKFILL_PAGE_SIZE:
+            break
+        before = batch[-1].signature
+
+    stats.gaps += 1
+    stats.last_gap = len(statuses)
+    stats.largest_gap = max(stats.largest_gap, len(statuses))
+    LOGGER.info(f"Backfilling {len(statuses)} signatures since slot {since_slot}")
+    for status in reversed(statuses):
+        if status.err is None and not SEEN.seen(status.signature):
+            stats.backfilled += 1
+            await handle_signature(status.signature)
+
+
+async def supervise_program_logs(
+    client: HedgedClient,
+    consume: Callable[[Any], Awaitable[None]],
+    handle_signature: Callable[[Signature], Awaitable[None]],
+    found: asyncio.Event,
+    stats: SubscriptionStats,
+) -> None:
+    global SUBSCRIPTION_ID
+
+    delay = RECONNECT_MIN_DELAY
+    while not found.is_set():
+        try:
+            async with ws_connect(ws_url(RPC or RPC_ENDPOINTS[0])) as websocket:
+                SUBSCRIPTION_ID = None
+                tasks: List[asyncio.Task] = []
+                try:
+                    await websocket.logs_subscribe(
+                        RpcTransactionLogsFilterMentions(PUMP_PROGRAM), "confirmed"
                     )
-                    if isinstance(pubkeys_parsed[1], Pubkey):
-                        MINT = str(pubkeys_parsed[1])
-                    elif isinstance(pubkeys_parsed[1], ParsedAccount):
-                        MINT = str(pubkeys_parsed[1].pubkey)
-                    print(f"PROGRAM LOGS: Found the token {MINT}")
-                    return True
-    return False
+                    first_resp = await websocket.recv()
+                    SUBSCRIPTION_ID = first_resp[0].result
+                    LOGGER.info("Subscribed to logs. Waiting for messages...")
+                    stats.connects += 1
+                    delay = RECONNECT_MIN_DELAY
+
+                    reader = asyncio.create_task(consume(websocket))
+                    tasks = [reader, asyncio.create_task(found.wait())]
+                    if stats.connects > 1 and stats.last_slot is not None:
+                        tasks.append(
+                            asyncio.create_task(
+                                backfill_gap(
+                                    client, stats.last_slot, handle_signature, stats
+                                )
+                            )
+                        )
+                    await asyncio.wait(tasks[:2], return_when=asyncio.FIRST_COMPLETED)
+                    if reader.done() and not found.is_set():
+                        reader.result()
+                        LOGGER.warning("Program logs websocket closed")
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    await wait_for_actions()
+                    if SUBSCRIPTION_ID:
+                        try:
+                            await websocket.logs_unsubscribe(SUBSCRIPTION_ID)
+                        except Exception:
+                            pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOGGER.warning(f"Program logs subscription dropped: {e}")
+
+        if found.is_set():
+            return
+        stats.reconnects += 1
+        LOGGER.info(f"Reconnecting to program logs in {delay:.1f}s...")
+        await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+        delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+
+async def run_serial(
+    client: HedgedClient, found: asyncio.Event, subscription: SubscriptionStats
+) -> None:
+    async def consume(websocket) -> None:
+        async for log in websocket:
+            trace = start_trace("program_logs")
+            subscription.track(log)
+            if await process_log(client, log, trace):
+                found.set()
+                return
+
+    async def handle_signature(sig: Signature) -> None:
+        if await process_signature(client, sig, trace=start_trace("backfill")):
+            found.set()
+
+    await supervise_program_logs(client, consume, handle_signature, found, subscription)
+
+
+async def run_pipeline(
+    client: HedgedClient, found: asyncio.Event, subscription: SubscriptionStats
+) -> None:
+    queue: asyncio.Queue[QueueItem] = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stats = PipelineStats()
+
+    async def consume(websocket) -> None:
+        await read_logs(websocket, queue, found, stats, subscription)
+
+    async def handle_signature(sig: Signature) -> None:
+        await enqueue_signature(queue, stats, sig, start_trace("backfill"))
+
+    tasks = [
+        asyncio.create_task(report_pipeline_stats(client, queue, stats, subscription)),
+        *[
+            asyncio.create_task(pipeline_worker(client, queue, found, stats))
+            for _ in range(PIPELINE_WORKERS)
+        ],
+    ]
+    try:
+        await supervise_program_logs(
+            client, consume, handle_signature, found, subscription
+        )
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        LOGGER.info(f"Pipeline: {stats.summary(queue.qsize())}")
 
 
 @SIO.event
@@ -150,53 +507,52 @@ async def connect() -> None:
 
 @SIO.event
 async def newCoinCreated(data) -> None:
-    global NAME
-    global TICKER
-    global MINT
+    trace = start_trace("api_logs")
+    if SEEN.seen(data["mint"]):
+        return
 
     name = data["name"]
     ticker = data["symbol"]
-    if ticker[0] == "$":
-        ticker = ticker[1:]
 
     print(f"CHECKING Token: {name} | Ticker: {ticker} (Api Logs)")
 
-    if name.lower() == NAME.lower() and ticker.lower() == TICKER.lower():
-        MINT = data["mint"]
-        print(f"API LOGS: Found the token {MINT}")
+    entry = WATCHLIST.match(name, ticker)
+    if entry:
+        mark(trace, "match")
+        if on_match(data["mint"], trace, "api_logs"):
+            print(f"API LOGS: Found the token {data['mint']} (matched {entry})")
+        await wait_for_actions()
         await SIO.disconnect()
 
 
 async def snipe_program_logs():
-    global SUBSCRIPTION_ID
-
-    async with AsyncClient(f"https://{RPC}") as client:
-        async with ws_connect(f"wss://{RPC}") as websocket:
-            try:
-                await websocket.logs_subscribe(
-                    RpcTransactionLogsFilterMentions(
-                        Pubkey.from_string(
-                            "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
-                        )
-                    ),
-                    "confirmed",
-                )
-                LOGGER.info("Subscribed to logs. Waiting for messages...")
-                first_resp = await websocket.recv()
-                SUBSCRIPTION_ID = first_resp[0].result
-
-                async for log in websocket:
-                    found = await process_log(client, log)
-                    if found:
-                        return
-            except KeyboardInterrupt:
-                LOGGER.info("Keyboard interrupt received. Cancelling tasks...")
-            except asyncio.CancelledError:
-                LOGGER.info("Program Logs Task was cancelled.")
-            finally:
-                if SUBSCRIPTION_ID:
-                    await websocket.logs_unsubscribe(SUBSCRIPTION_ID)
-                LOGGER.info("Cleaned up resources.")
+    found = MATCHED
+    subscription = SubscriptionStats()
+
+    async with HedgedClient(RPC_ENDPOINTS) as client:
+        for index, endpoint in enumerate(client.endpoints):
+            PREWARMER.add(
+                f"rpc {endpoint.url}",
+                functools.partial(client.ping, index),
+                PREWARM_RPC_INTERVAL,
+            )
+        try:
+            if PIPELINE:
+                await run_pipeline(client, found, subscription)
+            else:
+                await run_serial(client, found, subscription)
+        except KeyboardInterrupt:
+            LOGGER.info("Keyboard interrupt received. Cancelling tasks...")
+        except asyncio.CancelledError:
+            LOGGER.info("Program Logs Task was cancelled.")
+        finally:
+            LOGGER.info(f"Subscription: {subscription.summary()}")
+            LOGGER.info(f"Seen cache: {SEEN.summary()}")
+            LOGGER.info(f"Transaction fetches: {TX_RETRY.stats.summary()}")
+            LOGGER.info(f"RPC endpoints: {client.summary()}")
+            for endpoint in client.endpoints:
+                PREWARMER.remove(f"rpc {endpoint.url}")
+            LOGGER.info("Cleaned up resources.")
 
 
 @SIO.event
@@ -204,70 +560,48 @@ async def disconnect() -> None:
     LOGGER.info("Disconnected from server")
 
 
+async def check_api_connected() -> None:
+    if not SIO.connected:
+        raise ConnectionError("socket.io is not connected")
+
+
 async def snipe_api_logs() -> bool:
     try:
         await SIO.connect(
-            "https://frontend-api.pump.fun?offset=0&limit=100&sort=last_trade_timestamp&order=DESC&includeNsfw=true",
+            f"{PUMP_API_URL}?offset=0&limit=100&sort=last_trade_timestamp&order=DESC&includeNsfw=true",
             transports=["websocket"],
             socketio_path="/socket.io/",
         )
+        PREWARMER.add(f"socket.io {PUMP_API_URL}", check_api_connected)
         LOGGER.info("Connected, waiting for messages...")
         await SIO.wait()
     except asyncio.CancelledError:
         LOGGER.info("Api Logs Task was cancelled.")
         return False
+    finally:
+        PREWARMER.remove(f"socket.io {PUMP_API_URL}")
     return True
 
 
-def get_pair(mint: str) -> str:
-    pair, _ = Pubkey.find_program_address(
-        [
-            bytes([98, 111, 110, 100, 105, 110, 103, 45, 99, 117, 114, 118, 101]),
-            bytes(Pubkey.from_string(mint)),
-        ],
-        Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"),
-    )
-    return str(pair)
-
-
-def run_script() -> None:
-    try:
-        subprocess.run(COMMAND, check=True)
-        LOGGER.info("AppleScript executed successfully.")
-    except subprocess.CalledProcessError as e:
-        LOGGER.error(f"An error occurred while executing the AppleScript: {e}")
-
-
 async def main() -> None:
-    LOGGER.info(f"Sniping: Token {NAME} | Ticker: (${TICKER})")
-
-    snipe_program_logs_task = asyncio.create_task(snipe_program_logs())
-    snipe_api_logs_task = asyncio.create_task(snipe_api_logs())
-
+    install_latency()
+    LOGGER.info(f"Sniping {len(WATCHLIST)} watchlist entries")
+    for entry in WATCHLIST.entries:
+        LOGGER.info(f"Watching: {entry}")
+    if PRECOMPUTE_MINTS_FILE:
+        count = precompute(read_mints(PRECOMPUTE_MINTS_FILE))
+        LOGGER.info(f"Precomputed bonding curves for {count} mints")
+
+    await start_actions()
     try:
-        await asyncio.wait(
-            [snipe_program_logs_task, snipe_api_logs_task],
-            return_when=asyncio.FIRST_COMPLETED,
+        await run_until_matched(
+            {"program_logs": snipe_program_logs, "api_logs": snipe_api_logs}
         )
     except asyncio.CancelledError:
         LOGGER.info("Tasks was cancelled.")
         return
 
-    if MINT:
-        ("Found mint:", MINT)
-        snipe_api_logs_task.cancel()
-        snipe_program_logs_task.cancel()
-    else:
-        LOGGER.error("Failed to find mint.")
-        return
-
-    PAIR = get_pair(MINT)
-    print("Pair:", PAIR)
-    with open(FILE_PATH, "w") as f:
-        f.write(
-            f"https://photon-sol.tinyastro.io/en/lp/{PAIR}?handle=4070371e951586cba5f04"
-        )
-    run_script()
+    await finish()
 
 
 if __name__ == "__main__":
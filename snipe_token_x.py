@@ -1,11 +1,18 @@
 import asyncio
 import aiohttp
+import functools
+import json
 import os
-import subprocess
+import time
+from dataclasses import dataclass
 from dotenv import load_dotenv
 import re
-from solders.pubkey import Pubkey  # type: ignore
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
+from latency import Trace, install as install_latency, mark, start_trace
+from mint_scanner import scan_mints
+from poll_scheduler import PollScheduler
+from sniper import PREWARMER, SEEN, finish, on_match, start_actions
+from url_expander import UrlExpander
 
 load_dotenv()
 
@@ -25,38 +32,115 @@ HEADERS: Dict[str, str] = {
     "X-RapidAPI-Host": "twitter154.p.rapidapi.com",
 }
 
-DESKTOP_PATH: str = os.path.join(os.path.expanduser("~"), "Desktop")
-DIR: str = os.path.join(DESKTOP_PATH, "scripts", "solana-bots")
-FILE_NAME: str = "pair.txt"
-FILE_PATH: str = os.path.join(DIR, FILE_NAME)
+POLL_RATE: float = float(os.getenv("TWITTER_POLL_RATE", "5"))
+POLL_BURST: float = float(os.getenv("TWITTER_POLL_BURST", "5"))
+HOT_USERS: List[str] = [
+    username.strip()
+    for username in os.getenv("TWITTER_HOT_USERS", "").split(",")
+    if username.strip()
+]
+REQUEST_TIMEOUT: float = float(os.getenv("TWITTER_REQUEST_TIMEOUT", "10"))
+CONNECTIONS_PER_HOST: int = int(os.getenv("TWITTER_CONNECTIONS_PER_HOST", "32"))
+STATS_INTERVAL: float = float(os.getenv("TWITTER_STATS_INTERVAL", "30"))
+STATE_FILE: str = os.getenv("TWITTER_STATE_FILE", "twitter_state.json")
+TCO_CACHE_SIZE: int = int(os.getenv("TCO_CACHE_SIZE", "10000"))
+TCO_CACHE_TTL: float = float(os.getenv("TCO_CACHE_TTL", "3600"))
+TCO_CONCURRENCY: int = int(os.getenv("TCO_CONCURRENCY", "8"))
+TCO_TIMEOUT: float = float(os.getenv("TCO_TIMEOUT", "3"))
+TCO_FOLLOW_REDIRECTS: bool = (
+    os.getenv("TCO_FOLLOW_REDIRECTS", "false").lower() == "true"
+)
 
-try:
-    os.makedirs(DIR, exist_ok=True)
-except Exception as e:
-    print(f"Error creating directory: {e}")
-    exit(1)
+WARM_URLS: Dict[str, str] = {
+    "rapidapi": "https://twitter154.p.rapidapi.com/",
+    "t.co": "https://t.co/",
+}
 
-SCRIPT_PATH = os.path.join(
-    DESKTOP_PATH, "scripts", "solana-bots", "scripts", "!1open-all-profiles-test.scpt"
-)
-COMMAND = ["osascript", SCRIPT_PATH]
+SHORT_URL_PATTERN: re.Pattern = re.compile(r"(https?://t\.co/\S+?)([\.,!?]*)(?:\s|$)")
+
+
+@dataclass
+class FetchStats:
+    fetches: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    last_time: float = 0.0
+    max_time: float = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.fetches += 1
+        self.total_time += elapsed
+        self.last_time = elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def summary(self) -> str:
+        avg = self.total_time / self.fetches if self.fetches else 0.0
+        return (
+            f"fetches={self.fetches} errors={self.errors} "
+            f"avg={avg * 1000:.0f}ms last={self.last_time * 1000:.0f}ms "
+            f"max={self.max_time * 1000:.0f}ms"
+        )
 
 
-async def expand_url(short_url: str) -> str:
+FETCH_STATS: Dict[str, FetchStats] = {}
+HIGH_WATER: Dict[str, int] = {}
+
+
+def load_high_water(path: str) -> Dict[str, int]:
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.head(short_url, allow_redirects=True) as response:
-                return str(response.url)
-    except aiohttp.ClientError as e:
-        print(f"Error expanding URL: {e}")
-        return short_url
+        with open(path, "r") as f:
+            return {username: int(newest) for username, newest in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+    except (ValueError, AttributeError) as e:
+        print(f"Ignoring unreadable tweet state {path}: {e}")
+        return {}
 
 
-async def replace_short_urls(text: str) -> str:
-    URL_PATTERN = re.compile(r"(https?://t\.co/\S+?)([\.,!?]*)(?:\s|$)")
+def save_high_water(path: str, marks: Dict[str, int]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({username: str(newest) for username, newest in marks.items()}, f)
+    os.replace(tmp_path, path)
 
-    matches = URL_PATTERN.findall(text)
-    tasks = [expand_url(url) for url, _ in matches]
+
+def tweet_id(tweet: Dict) -> int:
+    try:
+        return int(tweet.get("tweet_id", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def unseen_tweets(username: str, tweets: List[Dict]) -> List[Dict]:
+    newest = HIGH_WATER.get(username)
+    if newest is None:
+        return tweets[:3]
+    return [tweet for tweet in tweets if tweet_id(tweet) > newest]
+
+
+def advance_high_water(username: str, tweets: List[Dict]) -> bool:
+    newest = max((tweet_id(tweet) for tweet in tweets), default=0)
+    if newest > HIGH_WATER.get(username, 0):
+        HIGH_WATER[username] = newest
+        return True
+    return False
+
+
+def create_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=CONNECTIONS_PER_HOST,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+        ),
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+    )
+
+
+async def replace_short_urls(expander: UrlExpander, text: str) -> str:
+    matches = SHORT_URL_PATTERN.findall(text)
+    tasks = [expander.expand(url) for url, _ in matches]
     expanded_urls = await asyncio.gather(*tasks)
 
     for (short_url, punctuation), expanded_url in zip(matches, expanded_urls):
@@ -65,99 +149,141 @@ async def replace_short_urls(text: str) -> str:
     return text
 
 
-def extract_and_validate_mint_address(text: str) -> Optional[str]:
-    url_pattern = re.compile(r"https:\/\/(www\.)?pump\.fun\/[A-Za-z0-9]+")
-    pubkey_pattern = re.compile(r"\b[1-9A-HJ-NP-Za-km-z]{43,44}\b")
-
-    url_match = url_pattern.search(text)
-    pubkey_match = pubkey_pattern.search(text)
-
-    if not url_match and not pubkey_match:
-        return None
+async def check_user(
+    session: aiohttp.ClientSession,
+    expander: UrlExpander,
+    scheduler: PollScheduler,
+    username: str,
+) -> Optional[Tuple[str, Optional[Trace]]]:
+    stats = FETCH_STATS.setdefault(username, FetchStats())
+    query = QUERY.copy()
+    query["username"] = username
+    started_at = time.perf_counter()
+    try:
+        async with session.get(URL, headers=HEADERS, params=query) as response:
+            trace = start_trace("twitter")
+            scheduler.observe(response.status, response.headers)
+            if response.status != 200:
+                stats.errors += 1
+                print(f"Status {response.status} ({username})")
+                return None
+            data = await response.json()
+        stats.record(time.perf_counter() - started_at)
+        tweets = unseen_tweets(username, data["results"])
+        for tweet in tweets:
+            text = await replace_short_urls(expander, tweet["text"])
+            print(f"Tweet: {text}")
+            mints = scan_mints(text)
+            if len(mints) > 1:
+                print(f"Candidates: {', '.join(mints)}")
+            for mint in mints:
+                if SEEN.seen(("tweet", mint)):
+                    print(f"Already tweeted {mint}")
+                    continue
+                advance_high_water(username, tweets)
+                return mint, trace
+        tracked = username in HIGH_WATER
+        if advance_high_water(username, tweets) and tracked:
+            scheduler.mark_posted(username)
+    except aiohttp.ClientError as e:
+        stats.errors += 1
+        print(f"Client error ({username}): {e}")
+    except Exception as e:
+        stats.errors += 1
+        print(f"Unexpected error ({username}): {e}")
+    return None
 
-    mint_address = None
 
-    if pubkey_match:
-        mint_address = pubkey_match.group(0)
-    elif url_match:
-        url = url_match.group(0)
-        mint_address = url.split("/")[-1]
+async def touch(session: aiohttp.ClientSession, url: str) -> None:
+    async with session.head(url, allow_redirects=False) as response:
+        await response.read()
 
-    if not mint_address:
-        return None
 
-    try:
-        Pubkey.from_string(mint_address)
-        return mint_address
-    except Exception as e:
-        return None
+def report_fetch_stats(scheduler: PollScheduler, expander: UrlExpander) -> None:
+    print(f"Polling: {scheduler.summary()}")
+    print(f"Connections: {PREWARMER.summary()}")
+    print(f"t.co cache: {expander.summary()}")
+    for username, stats in FETCH_STATS.items():
+        print(f"  {username}: {stats.summary()}")
 
 
 async def snipe_consume() -> Optional[str]:
-    while True:
-        for username in TWITTER_USERS:
-            async with aiohttp.ClientSession() as session:
-                try:
-                    query = QUERY.copy()
-                    query["username"] = username
-                    async with session.get(
-                        URL, headers=HEADERS, params=query
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            tweets = data["results"][:3]
-                            for tweet in tweets:
-                                text = tweet["text"]
-                                text = await replace_short_urls(text)
-                                print(f"Tweet: {text}")
-                                mint = extract_and_validate_mint_address(text)
-                                if mint:
-                                    return mint
-                except aiohttp.ClientError as e:
-                    print(f"Client error: {e}")
-                except Exception as e:
-                    print(f"Unexpected error: {e}")
-            await asyncio.sleep(0.3)
-        await asyncio.sleep(0.5)
-        print("\n\n")
-
-
-def run_script() -> None:
-    try:
-        subprocess.run(COMMAND, check=True)
-        print("AppleScript executed successfully.")
-    except subprocess.CalledProcessError as e:
-        print(f"An error occurred while executing the AppleScript: {e}")
-
-
-def get_pair(mint: str) -> str:
-    pair, _ = Pubkey.find_program_address(
-        [
-            bytes([98, 111, 110, 100, 105, 110, 103, 45, 99, 117, 114, 118, 101]),
-            bytes(Pubkey.from_string(mint)),
-        ],
-        Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"),
-    )
-    return str(pair)
+    HIGH_WATER.update(load_high_water(STATE_FILE))
+    found: asyncio.Queue[Tuple[str, Optional[Trace]]] = asyncio.Queue()
+    pending: Set[asyncio.Task] = set()
+
+    async with create_session() as session:
+        expander = UrlExpander(
+            session,
+            max_size=TCO_CACHE_SIZE,
+            ttl=TCO_CACHE_TTL,
+            concurrency=TCO_CONCURRENCY,
+            timeout=TCO_TIMEOUT,
+            follow_redirects=TCO_FOLLOW_REDIRECTS,
+        )
+        scheduler = PollScheduler(
+            TWITTER_USERS, POLL_RATE, POLL_BURST, hot_users=HOT_USERS
+        )
+        for name, url in WARM_URLS.items():
+            PREWARMER.add(name, functools.partial(touch, session, url))
+
+        async def poll(username: str) -> None:
+            result = await check_user(session, expander, scheduler, username)
+            if result:
+                found.put_nowait(result)
+
+        async def schedule() -> None:
+            saved = dict(HIGH_WATER)
+            reported_at = time.monotonic()
+            while True:
+                username = await scheduler.next_user()
+                task = asyncio.create_task(poll(username))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                if HIGH_WATER != saved:
+                    save_high_water(STATE_FILE, HIGH_WATER)
+                    saved = dict(HIGH_WATER)
+                if time.monotonic() - reported_at >= STATS_INTERVAL:
+                    report_fetch_stats(scheduler, expander)
+                    reported_at = time.monotonic()
+
+        scheduler_task = asyncio.create_task(schedule())
+        getter = asyncio.create_task(found.get())
+        try:
+            await asyncio.wait(
+                [getter, scheduler_task], return_when=asyncio.FIRST_COMPLETED
+            )
+            if not getter.done():
+                await scheduler_task
+                raise RuntimeError("Twitter scheduler stopped")
+            mint, trace = getter.result()
+            mark(trace, "match")
+            on_match(mint, trace, "twitter")
+            return mint
+        finally:
+            getter.cancel()
+            scheduler_task.cancel()
+            for task in [*pending]:
+                task.cancel()
+            await asyncio.gather(
+                getter, scheduler_task, *pending, return_exceptions=True
+            )
+            save_high_water(STATE_FILE, HIGH_WATER)
+            for name in WARM_URLS:
+                PREWARMER.remove(name)
 
 
 async def main() -> None:
+    install_latency()
+    if not TWITTER_USERS:
+        print("No Twitter users configured.")
+        return
     users = ", ".join(TWITTER_USERS)
     print(f"Sniping {users}...")
 
-    mint = await snipe_consume()
-
-    if not mint:
-        print("Failed to find mint.")
-        return
-
-    PAIR = get_pair(mint)
-    print("Pair:", PAIR)
-    with open(FILE_PATH, "w") as f:
-        f.write(
-            f"https://photon-sol.tinyastro.io/en/lp/{PAIR}?handle=4070371e951586cba5f04"
-        )
-    run_script()
+    await start_actions()
+    await snipe_consume()
+    await finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+from actions import ActionDispatcher, build_dispatcher
+from dedupe import SeenCache
+from dotenv import load_dotenv
+from latency import Trace, mark
+from prewarm import Prewarmer
+from pump_pda import get_pair
+from watchlist import Watchlist, WatchEntry, load_watchlist
+
+load_dotenv()
+
+LOGGER: logging.Logger = logging.getLogger("sniper")
+
+NAME: str = "TESTBABA"
+TICKER: str = "BABUN"
+WATCHLIST_FILE: str = os.getenv("WATCHLIST_FILE", "")
+
+WATCHLIST: Watchlist = (
+    load_watchlist(WATCHLIST_FILE)
+    if WATCHLIST_FILE
+    else Watchlist([WatchEntry(NAME, TICKER, "default")])
+)
+
+SEEN: SeenCache = SeenCache(
+    max_size=int(os.getenv("SEEN_CACHE_SIZE", "100000")),
+    ttl=float(os.getenv("SEEN_CACHE_TTL", "600")),
+)
+
+DISPATCHER: ActionDispatcher = build_dispatcher()
+PREWARMER: Prewarmer = Prewarmer()
+
+MINT: Optional[str] = None
+PAIR: Optional[str] = None
+MATCH_SOURCE: Optional[str] = None
+MATCH_TRACE: Optional[Trace] = None
+ACTION_TASK: Optional[asyncio.Task] = None
+MATCHED: asyncio.Event = asyncio.Event()
+
+
+async def launch_actions(mint: str, trace: Optional[Trace]) -> bool:
+    global PAIR
+
+    cold = PREWARMER.cold()
+    if cold:
+        LOGGER.warning(f"Dispatching with cold connections: {', '.join(cold)}")
+    PAIR = get_pair(mint)
+    mark(trace, "pda_derived")
+    print("Pair:", PAIR)
+    return await DISPATCHER.dispatch(mint, PAIR, trace)
+
+
+def on_match(mint: str, trace: Optional[Trace], source: str) -> bool:
+    global MINT
+    global MATCH_SOURCE
+    global MATCH_TRACE
+    global ACTION_TASK
+
+    if MINT is not None:
+        return False
+    MINT = mint
+    MATCH_SOURCE = source
+    MATCH_TRACE = trace
+    ACTION_TASK = asyncio.create_task(launch_actions(mint, trace))
+    MATCHED.set()
+    LOGGER.info(f"{source} matched {mint} first")
+    return True
+
+
+async def start_actions() -> None:
+    await DISPATCHER.start()
+    for name, ping in DISPATCHER.pings().items():
+        PREWARMER.add(name, ping)
+
+
+async def wait_for_actions() -> None:
+    if ACTION_TASK is not None:
+        await asyncio.wait([ACTION_TASK])
+
+
+async def run_source(name: str, source: Callable[[], Awaitable[Any]]) -> None:
+    try:
+        await source()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        LOGGER.error(f"Source {name} failed: {e!r}")
+    else:
+        LOGGER.info(f"Source {name} stopped")
+
+
+async def run_until_matched(sources: Dict[str, Callable[[], Awaitable[Any]]]) -> None:
+    tasks = [
+        asyncio.create_task(run_source(name, source), name=name)
+        for name, source in sources.items()
+    ]
+    matched = asyncio.create_task(MATCHED.wait())
+    try:
+        await asyncio.wait(
+            [matched, asyncio.gather(*tasks)], return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        for task in [*tasks, matched]:
+            task.cancel()
+        await asyncio.gather(*tasks, matched, return_exceptions=True)
+
+
+async def finish() -> None:
+    try:
+        if ACTION_TASK is None:
+            LOGGER.error("Failed to find mint.")
+        elif not await ACTION_TASK:
+            LOGGER.error("Some actions failed.")
+    finally:
+        LOGGER.info(f"Connections: {PREWARMER.summary()}")
+        await PREWARMER.stop()
+        await DISPATCHER.close()
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List
+from dotenv import load_dotenv
+from latency import install as install_latency
+from pump_pda import precompute, read_mints
+from sniper import WATCHLIST, finish, run_until_matched, start_actions
+from snipe_token_logs import PRECOMPUTE_MINTS_FILE, snipe_api_logs, snipe_program_logs
+from snipe_token_x import TWITTER_USERS, snipe_consume
+
+load_dotenv()
+logging.basicConfig(level=logging.INFO)
+LOGGER: logging.Logger = logging.getLogger("sniper_daemon")
+
+SOURCES: Dict[str, Callable[[], Awaitable[Any]]] = {
+    "program_logs": snipe_program_logs,
+    "api_logs": snipe_api_logs,
+    "twitter": snipe_consume,
+}
+ENABLED_SOURCES: List[str] = [
+    source.strip()
+    for source in os.getenv("SNIPER_SOURCES", ",".join(SOURCES)).split(",")
+    if source.strip()
+]
+
+
+def select_sources() -> List[str]:
+    selected = []
+    for name in ENABLED_SOURCES:
+        if name not in SOURCES:
+            LOGGER.warning(
+                f"Unknown source {name}, expected one of {', '.join(SOURCES)}"
+            )
+        elif name == "twitter" and not TWITTER_USERS:
+            LOGGER.info("No Twitter users configured, skipping the twitter source")
+        else:
+            selected.append(name)
+    return selected
+
+
+async def main() -> None:
+    install_latency()
+    LOGGER.info(f"Sniping {len(WATCHLIST)} watchlist entries")
+    for entry in WATCHLIST.entries:
+        LOGGER.info(f"Watching: {entry}")
+    if PRECOMPUTE_MINTS_FILE:
+        count = precompute(read_mints(PRECOMPUTE_MINTS_FILE))
+        LOGGER.info(f"Precomputed bonding curves for {count} mints")
+
+    sources = select_sources()
+    if not sources:
+        LOGGER.error("No sources enabled.")
+        return
+    LOGGER.info(f"Sources: {', '.join(sources)}")
+
+    await start_actions()
+    await run_until_matched({name: SOURCES[name] for name in sources})
+    await finish()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        LOGGER.info("Exiting...")
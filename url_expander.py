@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+from urllib.parse import urljoin
+import aiohttp
+
+
+class UrlExpander:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_size: int = 10_000,
+        ttl: float = 3600.0,
+        concurrency: int = 8,
+        timeout: float = 3.0,
+        follow_redirects: bool = False,
+    ) -> None:
+        self.session = session
+        self.max_size = max_size
+        self.ttl = ttl
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.follow_redirects = follow_redirects
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def lookup(self, url: str) -> str:
+        entry = self.cache.get(url)
+        if entry is None:
+            return ""
+        stored_at, expanded = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self.cache[url]
+            return ""
+        self.cache.move_to_end(url)
+        return expanded
+
+    def store(self, url: str, expanded: str) -> None:
+        self.cache[url] = (time.monotonic(), expanded)
+        self.cache.move_to_end(url)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+
+    async def expand(self, url: str) -> str:
+        expanded = self.lookup(url)
+        if expanded:
+            self.hits += 1
+            return expanded
+
+        task = self.inflight.get(url)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self.resolve(url))
+            self.inflight[url] = task
+            task.add_done_callback(lambda _: self.inflight.pop(url, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def resolve(self, url: str) -> str:
+        async with self.semaphore:
+            try:
+                async with self.session.head(
+                    url, allow_redirects=self.follow_redirects, timeout=self.timeout
+                ) as response:
+                    location = response.headers.get("Location")
+                    if location and not self.follow_redirects:
+                        expanded = urljoin(url, location)
+                    else:
+                        expanded = str(response.url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.errors += 1
+                print(f"Error expanding URL {url}: {e!r}")
+                return url
+        self.store(url, expanded)
+        return expanded
+
+    def summary(self) -> str:
+        return (
+            f"size={len(self.cache)} hits={self.hits} misses={self.misses} "
+            f"coalesced={self.coalesced} errors={self.errors}"
+        )
@@ -0,0 +1,172 @@
+import argparse
+import base58
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from chunk_pool import map_chunks
+from convert_json_base58 import KEYPAIR_LENGTH, read_key_file, scan_dir
+
+BAD_KEYS_TARGET = "bad_keys.jsonl"
+MIN_KEY_LENGTH = 10
+PROBLEMS = ("ok", "malformed", "short", "mismatch", "duplicate")
+
+Entry = Tuple[str, str, str, str]  # location, kind, payload, expected public key
+Checked = Tuple[str, bytes, str, str]  # location, public key, problem, detail
+
+
+def decode_base58_key(value: str) -> bytes:
+    try:
+        decoded = base58.b58decode(value)
+    except ValueError:
+        raise ValueError("not base58") from None
+    if len(decoded) != KEYPAIR_LENGTH:
+        raise ValueError(f"expected {KEYPAIR_LENGTH} bytes, got {len(decoded)}")
+    return decoded
+
+
+def check_entry(entry: Entry) -> Checked:
+    location, kind, payload, expected = entry
+    if kind == "short":
+        return location, b"", "short", f"{len(payload)} characters"
+    try:
+        if kind == "file":
+            secret = read_key_file(payload)
+        else:
+            secret = decode_base58_key(payload)
+    except (OSError, ValueError) as e:
+        return location, b"", "malformed", str(e)
+
+    public_key = secret[32:]
+    holds = Pubkey.from_bytes(public_key)
+    try:
+        Keypair.from_bytes(secret)
+    except Exception:
+        derived = Keypair.from_seed(secret[:32]).pubkey()
+        return location, b"", "mismatch", f"holds {holds}, seed derives {derived}"
+    if expected and expected != str(holds):
+        detail = f"public_key column {expected}, secret holds {holds}"
+        return location, b"", "mismatch", detail
+    return location, public_key, "", ""
+
+
+def check_chunk(chunk: List[Entry]) -> List[Checked]:
+    return [check_entry(entry) for entry in chunk]
+
+
+def read_dir_entries(folder: str) -> Iterator[Entry]:
+    for file_path in scan_dir(folder):
+        yield file_path, "file", file_path, ""
+
+
+def read_txt_entries(input_file: str) -> Iterator[Entry]:
+    with open(input_file, "r") as f:
+        for idx, line in enumerate(f, start=1):
+            value = line.strip()
+            if not value:
+                continue
+            kind = "short" if len(value) < MIN_KEY_LENGTH else "base58"
+            yield f"{input_file}:{idx}", kind, value, ""
+
+
+def read_csv_entries(input_file: str) -> Iterator[Entry]:
+    with open(input_file, "r", newline="") as f:
+        rows = csv.reader(f, delimiter=",")
+        header = next(rows, [])
+        key_column = header.index("private_key") if "private_key" in header else 1
+        public_key_column = (
+            header.index("public_key") if "public_key" in header else None
+        )
+        for idx, row in enumerate(rows, start=2):
+            value = row[key_column].strip() if len(row) > key_column else ""
+            expected = ""
+            if public_key_column is not None and len(row) > public_key_column:
+                expected = row[public_key_column].strip()
+            kind = "short" if len(value) < MIN_KEY_LENGTH else "base58"
+            yield f"{input_file}:{idx}", kind, value, expected
+
+
+def read_entries(source: str) -> Iterator[Entry]:
+    if os.path.isdir(source):
+        return read_dir_entries(source)
+    _, ext = os.path.splitext(source)
+    if ext == ".csv":
+        return read_csv_entries(source)
+    if ext == ".txt":
+        return read_txt_entries(source)
+    raise ValueError(f"Unsupported source {source}, expected a folder, .csv or .txt")
+
+
+def verify(
+    sources: List[str],
+    output: str = BAD_KEYS_TARGET,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> Counter:
+    counts: Counter = Counter()
+    started_at = time.perf_counter()
+    with open(output, "w") as f:
+        for source in sources:
+            in_source: Dict[bytes, str] = {}
+            for results in map_chunks(
+                check_chunk, read_entries(source), chunk_size, workers
+            ):
+                for location, public_key, problem, detail in results:
+                    if not problem:
+                        if public_key not in in_source:
+                            in_source[public_key] = location
+                            counts["ok"] += 1
+                            continue
+                        problem = "duplicate"
+                        detail = f"same public key as {in_source[public_key]}"
+                    counts[problem] += 1
+                    bad = {"location": location, "problem": problem, "detail": detail}
+                    if public_key:
+                        bad["public_key"] = str(Pubkey.from_bytes(public_key))
+                    f.write(json.dumps(bad) + "\n")
+
+    elapsed = time.perf_counter() - started_at
+    total = sum(counts.values())
+    print(
+        f"Verified {total} keys in {elapsed:.2f}s "
+        f"({total / elapsed if elapsed else 0:.0f} keys/s)"
+    )
+    print(" ".join(f"{problem}={counts[problem]}" for problem in PROBLEMS))
+    if total > counts["ok"]:
+        print(f"Bad entries written to {output}")
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check keypairs for malformed entries, seed/public key "
+        "mismatches and duplicates."
+    )
+    parser.add_argument(
+        "sources", nargs="+", help="Keypair JSON folders, .csv or .txt files"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=BAD_KEYS_TARGET,
+        help=f"JSON lines report of bad entries (default: {BAD_KEYS_TARGET})",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Worker processes"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=1000, help="Keys per worker task"
+    )
+    args = parser.parse_args()
+
+    counts = verify(args.sources, args.output, args.workers, args.chunk_size)
+    sys.exit(0 if sum(counts.values()) == counts["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
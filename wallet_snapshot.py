@@ -0,0 +1,316 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+import aiohttp
+from dotenv import load_dotenv
+from spl.token.constants import TOKEN_PROGRAM_ID
+from chunk_pool import chunked
+from convert_json_base58 import CSV_TARGET
+from rpc_hedge import rpc_url
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:
+    pa = pq = None
+
+load_dotenv()
+
+RPC: str = os.getenv("RPC", "")
+SNAPSHOT_TARGET = Path("snapshot.csv")
+SNAPSHOT_CONCURRENCY: int = int(os.getenv("SNAPSHOT_CONCURRENCY", "16"))
+SNAPSHOT_TIMEOUT: float = float(os.getenv("SNAPSHOT_TIMEOUT", "30"))
+SNAPSHOT_RETRIES: int = int(os.getenv("SNAPSHOT_RETRIES", "5"))
+MAX_ACCOUNTS_PER_REQUEST = 100  # getMultipleAccounts limit
+TOKEN_BATCH_SIZE = 25  # getTokenAccountsByOwner calls per JSON-RPC batch
+LAMPORTS_PER_SOL = 1_000_000_000
+COLUMNS = ["name", "public_key", "lamports", "sol", "token_accounts", "tokens"]
+
+Wallet = Tuple[str, str]
+Row = Dict[str, Any]
+
+
+def read_wallets(csv_target: Path) -> Iterator[Wallet]:
+    with open(csv_target, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("public_key"):
+                yield row.get("name", ""), row["public_key"]
+
+
+class RpcError(Exception):
+    pass
+
+
+class SnapshotClient:
+    def __init__(
+        self,
+        url: str,
+        concurrency: int = SNAPSHOT_CONCURRENCY,
+        timeout: float = SNAPSHOT_TIMEOUT,
+        retries: int = SNAPSHOT_RETRIES,
+        token_batch_size: int = TOKEN_BATCH_SIZE,
+    ) -> None:
+        self.url = rpc_url(url)
+        self.retries = retries
+        self.token_batch_size = max(1, token_batch_size)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=concurrency, keepalive_timeout=60, ttl_dns_cache=300
+            ),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        )
+        self.next_id = 0
+        self.requests = 0
+        self.calls = 0
+        self.retried = 0
+
+    async def close(self) -> None:
+        await self.session.close()
+
+    def call(self, method: str, params: List) -> Dict:
+        self.next_id += 1
+        return {
+            "jsonrpc": "2.0",
+            "id": self.next_id,
+            "method": method,
+            "params": params,
+        }
+
+    async def post(self, body: Any) -> Any:
+        delay = 0.25
+        for attempt in range(self.retries + 1):
+            async with self.semaphore:
+                try:
+                    async with self.session.post(self.url, json=body) as response:
+                        if response.status == 429 or response.status >= 500:
+                            raise RpcError(f"HTTP {response.status}")
+                        response.raise_for_status()
+                        self.requests += 1
+                        return await response.json(content_type=None)
+                except (aiohttp.InvalidURL, aiohttp.NonHttpUrlClientError) as e:
+                    raise RpcError(f"Bad RPC URL {self.url}: {e!r}") from e
+                except (aiohttp.ClientError, asyncio.TimeoutError, RpcError) as e:
+                    if attempt == self.retries:
+                        raise RpcError(f"{body_methods(body)} failed: {e!r}") from e
+            self.retried += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5.0)
+
+    async def request(self, calls: List[Dict]) -> List[Any]:
+        self.calls += len(calls)
+        responses = await self.post(calls[0] if len(calls) == 1 else calls)
+        if isinstance(responses, dict):
+            responses = [responses]
+        by_id = {response.get("id"): response for response in responses}
+        results = []
+        for call in calls:
+            response = by_id.get(call["id"], {})
+            if "error" in response or "result" not in response:
+                raise RpcError(f"{call['method']}: {response.get('error', response)}")
+            results.append(response["result"])
+        return results
+
+    async def get_lamports(self, public_keys: List[str]) -> List[Optional[int]]:
+        (result,) = await self.request(
+            [
+                self.call(
+                    "getMultipleAccounts",
+                    [
+                        public_keys,
+                        {"encoding": "base64", "dataSlice": {"offset": 0, "length": 0}},
+                    ],
+                )
+            ]
+        )
+        return [account["lamports"] if account else None for account in result["value"]]
+
+    async def get_token_balances(self, public_keys: List[str]) -> List[Dict[str, str]]:
+        batches = [
+            public_keys[i : i + self.token_batch_size]
+            for i in range(0, len(public_keys), self.token_batch_size)
+        ]
+        results = await asyncio.gather(
+            *[
+                self.request(
+                    [
+                        self.call(
+                            "getTokenAccountsByOwner",
+                            [
+                                owner,
+                                {"programId": str(TOKEN_PROGRAM_ID)},
+                                {"encoding": "jsonParsed"},
+                            ],
+                        )
+                        for owner in batch
+                    ]
+                )
+                for batch in batches
+            ]
+        )
+        return [token_balances(result) for batch in results for result in batch]
+
+    async def snapshot(self, wallets: List[Wallet]) -> List[Row]:
+        public_keys = [public_key for _, public_key in wallets]
+        lamports, tokens = await asyncio.gather(
+            self.get_lamports(public_keys), self.get_token_balances(public_keys)
+        )
+        return [
+            {
+                "name": name,
+                "public_key": public_key,
+                "lamports": balance or 0,
+                "sol": (balance or 0) / LAMPORTS_PER_SOL,
+                "token_accounts": len(balances),
+                "tokens": json.dumps(balances, separators=(",", ":")),
+            }
+            for (name, public_key), balance, balances in zip(wallets, lamports, tokens)
+        ]
+
+
+def body_methods(body: Any) -> str:
+    calls = body if isinstance(body, list) else [body]
+    return f"{calls[0]['method']} x{len(calls)}"
+
+
+def token_balances(result: Dict) -> Dict[str, str]:
+    balances: Dict[str, str] = {}
+    for account in result["value"]:
+        info = account["account"]["data"]["parsed"]["info"]
+        amount = info["tokenAmount"]
+        if amount["amount"] != "0":
+            balances[info["mint"]] = amount["uiAmountString"]
+    return balances
+
+
+class CsvSnapshotWriter:
+    def __init__(self, path: Path) -> None:
+        self.f = open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.f, COLUMNS, lineterminator="\n")
+        self.writer.writeheader()
+
+    def write(self, rows: List[Row]) -> None:
+        self.writer.writerows(rows)
+
+    def close(self) -> None:
+        self.f.close()
+
+
+class ParquetSnapshotWriter:
+    def __init__(self, path: Path) -> None:
+        self.schema = pa.schema(
+            [
+                ("name", pa.string()),
+                ("public_key", pa.string()),
+                ("lamports", pa.uint64()),
+                ("sol", pa.float64()),
+                ("token_accounts", pa.uint32()),
+                ("tokens", pa.string()),
+            ]
+        )
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows: List[Row]) -> None:
+        self.writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+async def take_snapshot(
+    input_file: Path,
+    output: Path,
+    url: str,
+    concurrency: int = SNAPSHOT_CONCURRENCY,
+    **kwargs,
+) -> None:
+    client = SnapshotClient(url, concurrency, **kwargs)
+    if output.suffix == ".parquet":
+        writer: Any = ParquetSnapshotWriter(output)
+    else:
+        writer = CsvSnapshotWriter(output)
+    started_at = time.perf_counter()
+    wallets = 0
+    lamports = 0
+    pending: Deque[asyncio.Task] = deque()
+
+    async def flush() -> None:
+        nonlocal wallets, lamports
+        rows = await pending.popleft()
+        writer.write(rows)
+        wallets += len(rows)
+        lamports += sum(row["lamports"] for row in rows)
+
+    try:
+        for chunk in chunked(read_wallets(input_file), MAX_ACCOUNTS_PER_REQUEST):
+            pending.append(asyncio.create_task(client.snapshot(chunk)))
+            while len(pending) >= concurrency or (pending and pending[0].done()):
+                await flush()
+        while pending:
+            await flush()
+    finally:
+        for task in pending:
+            task.cancel()
+        writer.close()
+        await client.close()
+
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"Snapshot of {wallets} wallets ({lamports / LAMPORTS_PER_SOL:.4f} SOL) "
+        f"written to {output} in {elapsed:.2f}s "
+        f"({wallets / elapsed if elapsed else 0:.0f} wallets/s, {client.requests} "
+        f"requests for {client.calls} calls, {client.retried} retries)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Snapshot SOL and SPL token balances of the wallets in keys.csv."
+    )
+    parser.add_argument("input_file", nargs="?", type=Path, default=CSV_TARGET)
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=SNAPSHOT_TARGET,
+        help="CSV, or Parquet if the name ends in .parquet (needs pyarrow)",
+    )
+    parser.add_argument("--rpc", default=RPC, help="RPC URL (default: $RPC)")
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=SNAPSHOT_CONCURRENCY,
+        help="Requests in flight",
+    )
+    parser.add_argument(
+        "--token-batch-size",
+        type=int,
+        default=TOKEN_BATCH_SIZE,
+        help="getTokenAccountsByOwner calls per JSON-RPC batch (1 disables batching)",
+    )
+    args = parser.parse_args()
+
+    if not args.rpc:
+        parser.error("Set RPC or pass --rpc")
+    if args.output.suffix == ".parquet" and pq is None:
+        parser.error("Parquet output needs pyarrow, install it or write a .csv")
+    asyncio.run(
+        take_snapshot(
+            args.input_file,
+            args.output,
+            args.rpc,
+            args.concurrency,
+            token_batch_size=args.token_batch_size,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import csv
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class WatchEntry(NamedTuple):
+    name: Optional[str]
+    ticker: Optional[str]
+    source: str = ""
+
+    def __str__(self) -> str:
+        name = self.name if self.name is not None else "*"
+        ticker = self.ticker if self.ticker is not None else "*"
+        label = f"{name} | {ticker}"
+        return f"{label} ({self.source})" if self.source else label
+
+
+def normalize(value: str) -> str:
+    value = unicodedata.normalize("NFKC", value).strip()
+    if value.startswith("$"):
+        value = value[1:].lstrip()
+    return value.casefold()
+
+
+class Watchlist:
+    def __init__(self, entries: Iterable[WatchEntry]) -> None:
+        self.index: Dict[Tuple[str, str], WatchEntry] = {}
+        self.entries: List[WatchEntry] = []
+        self.has_name_only = False
+        self.has_ticker_only = False
+
+        for entry in entries:
+            if not entry.name and not entry.ticker:
+                continue
+            key = (
+                normalize(entry.name) if entry.name else "",
+                normalize(entry.ticker) if entry.ticker else "",
+            )
+            if key in self.index:
+                print(f"Duplicate watchlist entry {entry}, keeping {self.index[key]}")
+                continue
+            self.index[key] = entry
+            self.entries.append(entry)
+            self.has_name_only |= not key[1]
+            self.has_ticker_only |= not key[0]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def match(self, name: str, ticker: str) -> Optional[WatchEntry]:
+        name_key = normalize(name)
+        ticker_key = normalize(ticker)
+        entry = self.index.get((name_key, ticker_key))
+        if entry is None and self.has_ticker_only:
+            entry = self.index.get(("", ticker_key))
+        if entry is None and self.has_name_only:
+            entry = self.index.get((name_key, ""))
+        return entry
+
+
+def load_watchlist(path: str) -> Watchlist:
+    entries = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for line_no, row in enumerate(csv.reader(f), start=1):
+            if not row or row[0].lstrip().startswith("#"):
+                continue
+            name = row[0].strip() or None
+            ticker = row[1].strip() if len(row) > 1 and row[1].strip() else None
+            entries.append(WatchEntry(name, ticker, f"{path}:{line_no}"))
+    return Watchlist(entries)